@@ -8,63 +8,47 @@ standalone CLI.
 from __future__ import annotations
 
 import argparse
+import importlib
+import sys
+from collections.abc import Callable
 
-from .commands.auth import cmd_accounts, cmd_login, cmd_logout, cmd_use, cmd_whoami
-from .commands.discover import cmd_notifications, cmd_search
-from .commands.feed import cmd_timeline
-from .commands.graph import cmd_graph
-from .commands.interactions import cmd_like, cmd_repost, cmd_unlike, cmd_unrepost
-from .commands.posts import cmd_delete, cmd_post, cmd_profile, cmd_quote
-from .commands.social import cmd_follow, cmd_unfollow
 from .ratelimit import set_throttle_enabled
 
 
-def build_parser() -> argparse.ArgumentParser:
-    parser = argparse.ArgumentParser(description="bskyctl - Bluesky CLI")
-    parser.add_argument(
-        "--profile",
-        help="Profile name to use for this command (overrides active/BSKY_PROFILE)",
-        default=None,
-    )
-    parser.add_argument(
-        "--no-throttle",
-        action="store_true",
-        help="Disable client-side request throttling (not recommended when running commands in parallel)",
-    )
+def _positive_int(value: str) -> int:
+    try:
+        n = int(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid int value: {value!r}") from None
+    if n < 1:
+        raise argparse.ArgumentTypeError("must be >= 1")
+    return n
 
-    subparsers = parser.add_subparsers(dest="command")
 
-    # login
-    login_p = subparsers.add_parser("login", help="Login to Bluesky (creates/updates a named profile)")
+def _add_login(login_p: argparse.ArgumentParser) -> None:
     login_p.add_argument("--name", help="Profile name to save under (e.g. work, personal)")
     login_p.add_argument("--handle", required=True, help="Your handle (e.g. user.bsky.social)")
     login_p.add_argument("--password", required=True, help="App password (not your main password)")
     login_p.add_argument("--set-active", action="store_true", help="Make this profile the active default")
 
-    # accounts
-    subparsers.add_parser("accounts", help="List configured profiles")
 
-    # use
-    use_p = subparsers.add_parser("use", help="Set the active profile")
+def _add_use(use_p: argparse.ArgumentParser) -> None:
     use_p.add_argument("name", help="Profile name")
 
-    # logout
-    logout_p = subparsers.add_parser("logout", help="Remove a saved profile")
+
+def _add_logout(logout_p: argparse.ArgumentParser) -> None:
     logout_p.add_argument("name", help="Profile name")
 
-    # whoami
-    subparsers.add_parser("whoami", help="Show current user")
 
-    # timeline
-    tl_p = subparsers.add_parser("timeline", aliases=["tl", "home"], help="Show home timeline")
+def _add_timeline(tl_p: argparse.ArgumentParser) -> None:
     tl_p.add_argument("-n", "--count", type=int, default=10, help="Number of posts")
 
-    # post
-    post_p = subparsers.add_parser("post", aliases=["p"], help="Create a post")
+
+def _add_post(post_p: argparse.ArgumentParser) -> None:
     post_p.add_argument("text", help="Post text")
 
-    # follow / unfollow
-    follow_p = subparsers.add_parser("follow", aliases=["f"], help="Follow a user")
+
+def _add_follow(follow_p: argparse.ArgumentParser) -> None:
     follow_p.add_argument("actor", nargs="?", help="Handle (e.g. @user.bsky.social) or DID")
     follow_p.add_argument("--list", help="Path to a newline-delimited list of handles/DIDs")
     # Defaults are intentionally conservative for write operations.
@@ -73,6 +57,12 @@ def build_parser() -> argparse.ArgumentParser:
     follow_p.add_argument("--max-delay", type=float, default=3.6, help="Max delay between requests (seconds)")
     follow_p.add_argument("--buffer", type=float, default=0.1, help="Extra delay buffer (e.g. 0.1 = +10%%)")
     follow_p.add_argument("--max", type=int, default=None, help="Max number of entries from the list")
+    follow_p.add_argument(
+        "--concurrency",
+        type=_positive_int,
+        default=None,
+        help="Max requests in flight, at most 8 (default: min(8, BSKY_REQ_RPS)); pacing still applies",
+    )
     follow_p.add_argument("--out-followed", dest="out_followed", help="Write followed actors (one per line)")
     follow_p.add_argument(
         "--out-skipped",
@@ -90,6 +80,22 @@ def build_parser() -> argparse.ArgumentParser:
         action="store_true",
         help="Rewrite --list as a queue (remove processed items) so you can resume after abort",
     )
+    follow_p.add_argument(
+        "--processed-log",
+        dest="processed_log",
+        help="Append each handled (done or skipped) actor here; cheaper than --out-remaining on long runs",
+    )
+    follow_p.add_argument(
+        "--resume",
+        action="store_true",
+        help="Skip actors already listed in --processed-log",
+    )
+    follow_p.add_argument(
+        "--checkpoint-every",
+        type=_positive_int,
+        default=25,
+        help="Rewrite --inplace/--out-remaining files every N actors (default: 25)",
+    )
     follow_p.add_argument(
         "--rewrite-input",
         action="store_true",
@@ -97,7 +103,8 @@ def build_parser() -> argparse.ArgumentParser:
     )
     follow_p.add_argument("--dry-run", action="store_true", help="Print actions without calling the API")
 
-    unfollow_p = subparsers.add_parser("unfollow", aliases=["uf"], help="Unfollow a user")
+
+def _add_unfollow(unfollow_p: argparse.ArgumentParser) -> None:
     unfollow_p.add_argument("actor", nargs="?", help="Handle (e.g. @user.bsky.social) or DID")
     unfollow_p.add_argument("--list", help="Path to a newline-delimited list of handles/DIDs")
     # Defaults are intentionally conservative for write operations.
@@ -116,6 +123,12 @@ def build_parser() -> argparse.ArgumentParser:
     )
     unfollow_p.add_argument("--buffer", type=float, default=0.1, help="Extra delay buffer (e.g. 0.1 = +10%%)")
     unfollow_p.add_argument("--max", type=int, default=None, help="Max number of entries from the list")
+    unfollow_p.add_argument(
+        "--concurrency",
+        type=_positive_int,
+        default=None,
+        help="Max requests in flight, at most 8 (default: min(8, BSKY_REQ_RPS)); pacing still applies",
+    )
     unfollow_p.add_argument(
         "--out-unfollowed",
         dest="out_unfollowed",
@@ -137,6 +150,22 @@ def build_parser() -> argparse.ArgumentParser:
         action="store_true",
         help="Rewrite --list as a queue (remove processed items) so you can resume after abort",
     )
+    unfollow_p.add_argument(
+        "--processed-log",
+        dest="processed_log",
+        help="Append each handled (done or skipped) actor here; cheaper than --out-remaining on long runs",
+    )
+    unfollow_p.add_argument(
+        "--resume",
+        action="store_true",
+        help="Skip actors already listed in --processed-log",
+    )
+    unfollow_p.add_argument(
+        "--checkpoint-every",
+        type=_positive_int,
+        default=25,
+        help="Rewrite --inplace/--out-remaining files every N actors (default: 25)",
+    )
     unfollow_p.add_argument(
         "--rewrite-input",
         action="store_true",
@@ -144,52 +173,67 @@ def build_parser() -> argparse.ArgumentParser:
     )
     unfollow_p.add_argument("--dry-run", action="store_true", help="Print actions without calling the API")
 
-    # like / unlike
-    like_p = subparsers.add_parser("like", aliases=["l"], help="Like a post by URL")
+
+def _add_like(like_p: argparse.ArgumentParser) -> None:
     like_p.add_argument("post", help="bsky.app post URL")
 
-    unlike_p = subparsers.add_parser("unlike", aliases=["ul"], help="Remove your like from a post by URL")
+
+def _add_unlike(unlike_p: argparse.ArgumentParser) -> None:
     unlike_p.add_argument("post", help="bsky.app post URL")
 
-    # repost / unrepost
-    repost_p = subparsers.add_parser("repost", aliases=["rp"], help="Repost (boost) a post by URL")
+
+def _add_repost(repost_p: argparse.ArgumentParser) -> None:
     repost_p.add_argument("post", help="bsky.app post URL")
 
-    unrepost_p = subparsers.add_parser(
-        "unrepost",
-        aliases=["urp"],
-        help="Remove your repost from a post by URL",
-    )
+
+def _add_unrepost(unrepost_p: argparse.ArgumentParser) -> None:
     unrepost_p.add_argument("post", help="bsky.app post URL")
 
-    # quote / cite
-    quote_p = subparsers.add_parser(
-        "quote",
-        aliases=["cite", "q"],
-        help="Quote/cite a post with your own text",
-    )
+
+def _add_quote(quote_p: argparse.ArgumentParser) -> None:
     quote_p.add_argument("post", help="bsky.app post URL")
     quote_p.add_argument("text", help="Your quote text")
 
-    # delete
-    del_p = subparsers.add_parser("delete", aliases=["del", "rm"], help="Delete a post")
+
+def _add_delete(del_p: argparse.ArgumentParser) -> None:
     del_p.add_argument("post_id", help="Post ID or URL")
 
-    # profile
-    profile_p = subparsers.add_parser("profile", help="Show profile")
+
+def _add_profile(profile_p: argparse.ArgumentParser) -> None:
     profile_p.add_argument("handle", nargs="?", help="Handle to look up (default: self)")
+    profile_p.add_argument("--json", action="store_true", help="Print the raw API response as JSON")
+    profile_p.add_argument(
+        "--cache-ttl",
+        type=float,
+        default=0,
+        help="Reuse a cached result younger than this many seconds (default: 0 = off)",
+    )
+
 
-    # search
-    search_p = subparsers.add_parser("search", aliases=["s"], help="Search posts")
+def _add_search(search_p: argparse.ArgumentParser) -> None:
     search_p.add_argument("query", help="Search query")
     search_p.add_argument("-n", "--count", type=int, default=10, help="Number of results")
+    search_p.add_argument("--json", action="store_true", help="Print the raw API response as JSON")
+    search_p.add_argument(
+        "--cache-ttl",
+        type=float,
+        default=0,
+        help="Reuse a cached result younger than this many seconds (default: 0 = off)",
+    )
+
 
-    # notifications
-    notif_p = subparsers.add_parser("notifications", aliases=["notif", "n"], help="Show notifications")
+def _add_notifications(notif_p: argparse.ArgumentParser) -> None:
     notif_p.add_argument("-n", "--count", type=int, default=20, help="Number of notifications")
+    notif_p.add_argument("--json", action="store_true", help="Print the raw API response as JSON")
+    notif_p.add_argument(
+        "--cache-ttl",
+        type=float,
+        default=0,
+        help="Reuse a cached result younger than this many seconds (default: 0 = off)",
+    )
 
-    # graph
-    graph_p = subparsers.add_parser("graph", help="Graph ops (followers/follows)")
+
+def _add_graph(graph_p: argparse.ArgumentParser) -> None:
     graph_sp = graph_p.add_subparsers(dest="graph_command")
 
     graph_export_p = graph_sp.add_parser(
@@ -228,55 +272,102 @@ def build_parser() -> argparse.ArgumentParser:
         help="Print progress every N items (0 disables)",
     )
 
+
+# name -> (module, function, aliases, help, argument builder). Both parsing
+# and dispatch work from this one table: main() builds only the selected
+# subcommand, and imports only its module under bskyctl.commands, so e.g.
+# `accounts` never loads the follow machinery.
+_Builder = Callable[[argparse.ArgumentParser], None]
+_COMMANDS: dict[str, tuple[str, str, tuple[str, ...], str, _Builder | None]] = {
+    "login": ("auth", "cmd_login", (), "Login to Bluesky (creates/updates a named profile)", _add_login),
+    "accounts": ("auth", "cmd_accounts", (), "List configured profiles", None),
+    "use": ("auth", "cmd_use", (), "Set the active profile", _add_use),
+    "logout": ("auth", "cmd_logout", (), "Remove a saved profile", _add_logout),
+    "whoami": ("auth", "cmd_whoami", (), "Show current user", None),
+    "timeline": ("feed", "cmd_timeline", ("tl", "home"), "Show home timeline", _add_timeline),
+    "post": ("posts", "cmd_post", ("p",), "Create a post", _add_post),
+    "follow": ("social", "cmd_follow", ("f",), "Follow a user", _add_follow),
+    "unfollow": ("social", "cmd_unfollow", ("uf",), "Unfollow a user", _add_unfollow),
+    "like": ("interactions", "cmd_like", ("l",), "Like a post by URL", _add_like),
+    "unlike": ("interactions", "cmd_unlike", ("ul",), "Remove your like from a post by URL", _add_unlike),
+    "repost": ("interactions", "cmd_repost", ("rp",), "Repost (boost) a post by URL", _add_repost),
+    "unrepost": (
+        "interactions",
+        "cmd_unrepost",
+        ("urp",),
+        "Remove your repost from a post by URL",
+        _add_unrepost,
+    ),
+    "quote": ("posts", "cmd_quote", ("cite", "q"), "Quote/cite a post with your own text", _add_quote),
+    "delete": ("posts", "cmd_delete", ("del", "rm"), "Delete a post", _add_delete),
+    "profile": ("posts", "cmd_profile", (), "Show profile", _add_profile),
+    "search": ("discover", "cmd_search", ("s",), "Search posts", _add_search),
+    "notifications": (
+        "discover",
+        "cmd_notifications",
+        ("notif", "n"),
+        "Show notifications",
+        _add_notifications,
+    ),
+    "graph": ("graph", "cmd_graph", (), "Graph ops (followers/follows)", _add_graph),
+}
+# Alias (or name) -> canonical name.
+_COMMAND_NAMES = {alias: name for name, spec in _COMMANDS.items() for alias in (name, *spec[2])}
+
+
+def build_parser(command: str | None = None) -> argparse.ArgumentParser:
+    """Build the CLI parser; with `command`, only that subcommand is registered."""
+
+    parser = argparse.ArgumentParser(description="bskyctl - Bluesky CLI")
+    parser.add_argument(
+        "--profile",
+        help="Profile name to use for this command (overrides active/BSKY_PROFILE)",
+        default=None,
+    )
+    parser.add_argument(
+        "--no-throttle",
+        action="store_true",
+        help="Disable client-side request throttling (not recommended when running commands in parallel)",
+    )
+
+    subparsers = parser.add_subparsers(dest="command")
+    selected = _COMMAND_NAMES.get(command)
+    for name in (selected,) if selected else _COMMANDS:
+        _module, _func, aliases, help_text, builder = _COMMANDS[name]
+        sub_p = subparsers.add_parser(name, aliases=list(aliases), help=help_text)
+        if builder is not None:
+            builder(sub_p)
+
     return parser
 
 
+def _selected_command(argv: list[str]) -> str | None:
+    """Return the subcommand in `argv` (skipping global options), or None."""
+
+    it = iter(argv)
+    for arg in it:
+        if len(arg) > 2 and "--profile".startswith(arg):  # argparse accepts --prof etc.
+            next(it, None)
+        elif arg.startswith("-"):
+            if arg in ("-h", "--help"):
+                return None
+        else:
+            return arg
+    return None
+
+
 def main(argv: list[str] | None = None) -> None:
-    parser = build_parser()
+    if argv is None:
+        argv = sys.argv[1:]
+    parser = build_parser(_selected_command(argv))
     args = parser.parse_args(argv)
 
     set_throttle_enabled(not bool(getattr(args, "no_throttle", False)))
 
-    commands = {
-        "login": cmd_login,
-        "accounts": cmd_accounts,
-        "use": cmd_use,
-        "logout": cmd_logout,
-        "whoami": cmd_whoami,
-        "timeline": cmd_timeline,
-        "tl": cmd_timeline,
-        "home": cmd_timeline,
-        "post": cmd_post,
-        "p": cmd_post,
-        "follow": cmd_follow,
-        "f": cmd_follow,
-        "unfollow": cmd_unfollow,
-        "uf": cmd_unfollow,
-        "like": cmd_like,
-        "l": cmd_like,
-        "unlike": cmd_unlike,
-        "ul": cmd_unlike,
-        "repost": cmd_repost,
-        "rp": cmd_repost,
-        "unrepost": cmd_unrepost,
-        "urp": cmd_unrepost,
-        "quote": cmd_quote,
-        "cite": cmd_quote,
-        "q": cmd_quote,
-        "delete": cmd_delete,
-        "del": cmd_delete,
-        "rm": cmd_delete,
-        "profile": cmd_profile,
-        "search": cmd_search,
-        "s": cmd_search,
-        "notifications": cmd_notifications,
-        "notif": cmd_notifications,
-        "n": cmd_notifications,
-        "graph": cmd_graph,
-    }
-
-    if args.command in commands:
-        commands[args.command](args)
+    name = _COMMAND_NAMES.get(args.command)
+    if name is not None:
+        module, func = _COMMANDS[name][:2]
+        getattr(importlib.import_module(f".commands.{module}", __package__), func)(args)
     else:
         parser.print_help()
 
@@ -3,7 +3,14 @@ from __future__ import annotations
 import sys
 
 from ..atproto_compat import require_atproto
-from ..config import load_config, resolve_profile, save_config
+from ..config import (
+    delete_session,
+    load_config,
+    load_config_cached,
+    resolve_profile,
+    save_config,
+    save_session,
+)
 
 
 def cmd_login(args) -> None:
@@ -34,6 +41,7 @@ def cmd_login(args) -> None:
             cfg["active"] = name
 
         save_config(cfg)
+        save_session(name, client)
         active_note = " (active)" if cfg.get("active") == name else ""
         print(f"Logged in profile '{name}' as {args.handle} ({client.me.did}){active_note}")
     except Exception as e:
@@ -42,7 +50,7 @@ def cmd_login(args) -> None:
 
 
 def cmd_whoami(args) -> None:
-    cfg = load_config()
+    cfg = load_config_cached()
     try:
         profile_name, _p = resolve_profile(cfg, profile=args.profile)
     except Exception:
@@ -58,7 +66,7 @@ def cmd_whoami(args) -> None:
 
 
 def cmd_accounts(_args) -> None:
-    cfg = load_config()
+    cfg = load_config_cached()
     profiles = cfg.get("profiles") or {}
     active = cfg.get("active")
 
@@ -69,11 +77,14 @@ def cmd_accounts(_args) -> None:
         )
         return
 
-    for name, p in profiles.items():
-        star = "*" if name == active else " "
-        handle = p.get("handle") or "(missing handle)"
-        did = p.get("did") or "(no did)"
-        print(f"{star} {name}: {handle}  {did}")
+    # One write for the whole table rather than a print() per profile.
+    sys.stdout.write(
+        "".join(
+            f"{'*' if name == active else ' '} {name}: "
+            f"{p.get('handle') or '(missing handle)'}  {p.get('did') or '(no did)'}\n"
+            for name, p in profiles.items()
+        )
+    )
 
 
 def cmd_use(args) -> None:
@@ -96,6 +107,7 @@ def cmd_logout(args) -> None:
 
     del profiles[args.name]
     cfg["profiles"] = profiles
+    delete_session(args.name)
 
     if cfg.get("active") == args.name:
         cfg["active"] = next(iter(profiles.keys()), None)
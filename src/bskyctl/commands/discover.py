@@ -1,61 +1,88 @@
 from __future__ import annotations
 
+import sys
+from functools import partial
+
+from ..atproto_compat import require_atproto
 from ..config import get_client
 from ..ratelimit import call_with_read_backoff
+from ..read_cache import cached_read, read_key
+from ..utils import write_json_stdout
+
+# reason -> output line, icon included.
+_NOTIF_FMT = {
+    "like": "❤️ @{author} liked your post · {time}",
+    "repost": "🔁 @{author} reposted · {time}",
+    "follow": "👤 @{author} followed you · {time}",
+    "reply": "💬 @{author} replied · {time}",
+    "mention": "📢 @{author} mentioned you · {time}",
+    "quote": "💭 @{author} quoted you · {time}",
+}
+_NOTIF_FALLBACK = "• {reason} from @{author} · {time}"
 
 
 def cmd_search(args) -> None:
-    client = get_client(profile=args.profile)
-    response = call_with_read_backoff(
-        lambda: client.app.bsky.feed.search_posts({"q": args.query, "limit": args.count})
+    _Client, _client_utils, models = require_atproto()
+
+    def fetch():
+        client = get_client(profile=args.profile)
+        return call_with_read_backoff(
+            partial(client.app.bsky.feed.search_posts, {"q": args.query, "limit": args.count})
+        )
+
+    response = cached_read(
+        read_key(args, "search", args.query, args.count),
+        args.cache_ttl,
+        models.AppBskyFeedSearchPosts.Response,
+        fetch,
     )
 
+    if args.json:
+        write_json_stdout(response.posts)
+        return
+
     if not response.posts:
         print("No results found.")
         return
 
+    out: list[str] = []
     for post in response.posts:
         author = post.author.handle
         text = post.record.text if hasattr(post.record, "text") else ""
         likes = post.like_count or 0
 
-        print(f"@{author}: {text[:150]}")
-        print(f"  ❤️ {likes}  🔗 https://bsky.app/profile/{author}/post/{post.uri.split('/')[-1]}")
-        print()
+        out.append(f"@{author}: {text[:150]}\n")
+        out.append(
+            f"  ❤️ {likes}  🔗 https://bsky.app/profile/{author}/post/{post.uri.rpartition('/')[2]}\n\n"
+        )
+    sys.stdout.write("".join(out))
 
 
 def cmd_notifications(args) -> None:
-    client = get_client(profile=args.profile)
-    response = call_with_read_backoff(
-        lambda: client.app.bsky.notification.list_notifications({"limit": args.count})
+    _Client, _client_utils, models = require_atproto()
+
+    def fetch():
+        client = get_client(profile=args.profile)
+        return call_with_read_backoff(
+            partial(client.app.bsky.notification.list_notifications, {"limit": args.count})
+        )
+
+    response = cached_read(
+        read_key(args, "notifications", args.count),
+        args.cache_ttl,
+        models.AppBskyNotificationListNotifications.Response,
+        fetch,
     )
 
+    if args.json:
+        write_json_stdout(response.notifications)
+        return
+
+    out: list[str] = []
     for notif in response.notifications:
         reason = notif.reason
         author = notif.author.handle
-        time_str = notif.indexed_at[:16] if notif.indexed_at else ""
-
-        icons = {
-            "like": "❤️",
-            "repost": "🔁",
-            "follow": "👤",
-            "reply": "💬",
-            "mention": "📢",
-            "quote": "💭",
-        }
-        icon = icons.get(reason, "•")
-
-        if reason == "like":
-            print(f"{icon} @{author} liked your post · {time_str}")
-        elif reason == "repost":
-            print(f"{icon} @{author} reposted · {time_str}")
-        elif reason == "follow":
-            print(f"{icon} @{author} followed you · {time_str}")
-        elif reason == "reply":
-            print(f"{icon} @{author} replied · {time_str}")
-        elif reason == "mention":
-            print(f"{icon} @{author} mentioned you · {time_str}")
-        elif reason == "quote":
-            print(f"{icon} @{author} quoted you · {time_str}")
-        else:
-            print(f"{icon} {reason} from @{author} · {time_str}")
+
+        fmt = _NOTIF_FMT.get(reason, _NOTIF_FALLBACK)
+        out.append(fmt.format(author=author, reason=reason, time=(notif.indexed_at or "")[:16]) + "\n")
+    sys.stdout.write("".join(out))
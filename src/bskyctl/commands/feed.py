@@ -1,32 +1,77 @@
 from __future__ import annotations
 
+import sys
 from datetime import datetime
+from functools import partial
 
 from ..config import get_client
 from ..ratelimit import call_with_read_backoff
 
+# app.bsky.feed.getTimeline accepts limit <= 100.
+TIMELINE_PAGE = 100
+
+_MONTHS = ("Jan", "Feb", "Mar", "Apr", "May", "Jun", "Jul", "Aug", "Sep", "Oct", "Nov", "Dec")
+
+
+def _short_time(created: str) -> str:
+    """Format an RFC 3339 timestamp like strftime("%b %d %H:%M"), by slicing.
+
+    The AppView always returns "YYYY-MM-DDTHH:MM:..." so a full datetime parse
+    per post is unnecessary; anything else goes through fromisoformat, which
+    accepts a trailing "Z" natively on 3.11+.
+    """
+
+    try:
+        month = int(created[5:7])
+        if 1 <= month <= 12 and created[4] == "-" and created[7] == "-" and created[13] == ":":
+            return f"{_MONTHS[month - 1]} {created[8:10]} {created[11:16]}"
+    except (IndexError, ValueError):
+        pass
+    try:
+        dt = datetime.fromisoformat(created)
+        return f"{_MONTHS[dt.month - 1]} {dt.day:02d} {dt.hour:02d}:{dt.minute:02d}"
+    except (TypeError, ValueError):
+        return created[:16] if created else ""
+
 
 def cmd_timeline(args) -> None:
+    count = int(args.count)
+    if count <= 0:
+        raise SystemExit("--count must be > 0")
+
     client = get_client(profile=args.profile)
-    response = call_with_read_backoff(lambda: client.get_timeline(limit=args.count))
-
-    for item in response.feed:
-        post = item.post
-        author = post.author.handle
-        text = post.record.text if hasattr(post.record, "text") else ""
-        created = post.record.created_at if hasattr(post.record, "created_at") else ""
-        likes = post.like_count or 0
-        reposts = post.repost_count or 0
-        replies = post.reply_count or 0
-
-        try:
-            dt = datetime.fromisoformat(created.replace("Z", "+00:00"))
-            time_str = dt.strftime("%b %d %H:%M")
-        except Exception:
-            time_str = created[:16] if created else ""
-
-        print(f"@{author} · {time_str}")
-        print(f"  {text[:200]}")
-        print(f"  ❤️ {likes}  🔁 {reposts}  💬 {replies}")
-        print(f"  🔗 https://bsky.app/profile/{author}/post/{post.uri.split('/')[-1]}")
-        print()
+
+    # getTimeline returns at most TIMELINE_PAGE posts per call; follow the
+    # cursor until --count posts are shown or the feed runs out.
+    remaining = count
+    cursor: str | None = None
+    while remaining > 0:
+        response = call_with_read_backoff(
+            partial(client.get_timeline, cursor=cursor, limit=min(TIMELINE_PAGE, remaining))
+        )
+        feed = response.feed[:remaining]
+
+        out: list[str] = []
+        for item in feed:
+            post = item.post
+            author = post.author.handle
+            text = post.record.text if hasattr(post.record, "text") else ""
+            created = post.record.created_at if hasattr(post.record, "created_at") else ""
+            likes = post.like_count or 0
+            reposts = post.repost_count or 0
+            replies = post.reply_count or 0
+
+            time_str = _short_time(created)
+
+            out.append(
+                f"@{author} · {time_str}\n"
+                f"  {text[:200]}\n"
+                f"  ❤️ {likes}  🔁 {reposts}  💬 {replies}\n"
+                f"  🔗 https://bsky.app/profile/{author}/post/{post.uri.rpartition('/')[2]}\n\n"
+            )
+        sys.stdout.write("".join(out))
+
+        remaining -= len(feed)
+        cursor = response.cursor
+        if not cursor or not feed:
+            break
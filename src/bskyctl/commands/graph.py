@@ -1,11 +1,13 @@
 from __future__ import annotations
 
+import hashlib
 from dataclasses import dataclass
 from datetime import datetime, timezone
+from functools import partial
 
 from ..config import get_client
 from ..ratelimit import call_with_read_backoff
-from ..utils import atomic_write_lines, normalize_handle
+from ..utils import atomic_text_writer, normalize_handle
 
 
 @dataclass
@@ -18,7 +20,7 @@ def _fetch_followers(client, actor: str, *, limit: int, cursor: str | None) -> _
     params: dict = {"actor": actor, "limit": limit}
     if cursor:
         params["cursor"] = cursor
-    resp = call_with_read_backoff(lambda: client.app.bsky.graph.get_followers(params))
+    resp = call_with_read_backoff(partial(client.app.bsky.graph.get_followers, params))
     return _Page(items=getattr(resp, "followers", []) or [], cursor=getattr(resp, "cursor", None))
 
 
@@ -26,46 +28,73 @@ def _fetch_follows(client, actor: str, *, limit: int, cursor: str | None) -> _Pa
     params: dict = {"actor": actor, "limit": limit}
     if cursor:
         params["cursor"] = cursor
-    resp = call_with_read_backoff(lambda: client.app.bsky.graph.get_follows(params))
+    resp = call_with_read_backoff(partial(client.app.bsky.graph.get_follows, params))
     return _Page(items=getattr(resp, "follows", []) or [], cursor=getattr(resp, "cursor", None))
 
 
-def _format_actor(item, mode: str) -> str:
+def _format_handle(item) -> str:
+    return getattr(item, "handle", None) or getattr(item, "did", None) or ""
+
+
+def _format_did(item) -> str:
+    return getattr(item, "did", None) or getattr(item, "handle", None) or ""
+
+
+def _format_handle_did(item) -> str:
     handle = getattr(item, "handle", None)
     did = getattr(item, "did", None)
-
-    if mode == "did":
-        return did or handle or ""
-    if mode == "handle+did":
-        if handle and did:
-            return f"{handle}\t{did}"
-        return handle or did or ""
-    # default: handle
+    if handle and did:
+        return f"{handle}\t{did}"
     return handle or did or ""
 
 
+# --format -> line formatter, picked once per export rather than per item.
+_FORMATTERS = {"handle": _format_handle, "did": _format_did, "handle+did": _format_handle_did}
+
+
+def _line_key(line: str) -> int:
+    # 8-byte digest instead of the string itself keeps the dedup set small for
+    # very large graphs (collisions are ~1e-8 likely even at a million lines).
+    return int.from_bytes(hashlib.blake2b(line.encode("utf-8"), digest_size=8).digest(), "big")
+
+
 def _collect_paged(
     fetch_page,
+    out,
     *,
+    union: set[int] | None,
     progress_prefix: str,
     actor: str,
     limit: int,
     mode: str,
     progress_every: int,
-) -> list[str]:
-    out: list[str] = []
-    seen: set[str] = set()
+) -> int:
+    """Stream unique lines of every page to `out`; return how many were unique.
+
+    With `union`, lines already written by an earlier section are counted but
+    not written again (used for --plain).
+    """
+
+    seen: set[int] = set()
+    formatter = _FORMATTERS.get(mode, _format_handle)
 
     cursor: str | None = None
     n = 0
     while True:
         page = fetch_page(actor=actor, limit=limit, cursor=cursor)
         for item in page.items:
-            line = _format_actor(item, mode).strip()
-            if not line or line in seen:
+            line = formatter(item).strip()
+            if not line:
+                continue
+            key = _line_key(line)
+            if key in seen:
                 continue
-            seen.add(line)
-            out.append(line)
+            seen.add(key)
+            if union is None:
+                out.write(line + "\n")
+            elif key not in union:
+                union.add(key)
+                out.write(line + "\n")
             n += 1
             if progress_every > 0 and n % progress_every == 0:
                 print(f"{progress_prefix}: {n} ...")
@@ -74,7 +103,7 @@ def _collect_paged(
         if not cursor:
             break
 
-    return out
+    return n
 
 
 def cmd_graph_export(args) -> None:
@@ -96,75 +125,40 @@ def cmd_graph_export(args) -> None:
 
     exported_at = datetime.now(timezone.utc).isoformat()
 
-    followers: list[str] = []
-    follows: list[str] = []
-
-    if only in ("followers", "both"):
-        print(f"Exporting followers for {actor} ...")
-        followers = _collect_paged(
-            lambda **kw: _fetch_followers(client, **kw),
-            progress_prefix="followers",
-            actor=actor,
-            limit=limit,
-            mode=mode,
-            progress_every=int(args.progress_every),
-        )
-
-    if only in ("follows", "both"):
-        print(f"Exporting follows for {actor} ...")
-        follows = _collect_paged(
-            lambda **kw: _fetch_follows(client, **kw),
-            progress_prefix="follows",
-            actor=actor,
-            limit=limit,
-            mode=mode,
-            progress_every=int(args.progress_every),
-        )
-
-    if args.plain:
-        # Plain list output (no headers/sections). If both is selected, emit a
-        # de-duped union in stable order: followers first, then new entries from follows.
-        lines: list[str] = []
-        seen: set[str] = set()
-
-        def add_many(xs: list[str]) -> None:
-            for x in xs:
-                if x in seen:
-                    continue
-                seen.add(x)
-                lines.append(x)
-
-        if only in ("followers", "both"):
-            add_many(followers)
-        if only in ("follows", "both"):
-            add_many(follows)
-
-        atomic_write_lines(args.out, lines)
-    else:
-        lines2: list[str] = []
-        lines2.append("# bskyctl graph export")
-        lines2.append(f"# actor: {actor}")
-        lines2.append(f"# exportedAt: {exported_at}")
-        lines2.append(f"# format: {mode}")
-        lines2.append("")
-
-        if only in ("followers", "both"):
-            lines2.append("[followers]")
-            lines2.extend(followers)
-            lines2.append("")
-
-        if only in ("follows", "both"):
-            lines2.append("[follows]")
-            lines2.extend(follows)
-            lines2.append("")
-
-        atomic_write_lines(args.out, lines2)
-
-    parts: list[str] = []
+    sections = []
     if only in ("followers", "both"):
-        parts.append(f"followers={len(followers)}")
+        sections.append(("followers", _fetch_followers))
     if only in ("follows", "both"):
-        parts.append(f"follows={len(follows)}")
+        sections.append(("follows", _fetch_follows))
+
+    # Plain list output (no headers/sections). If both is selected, emit a
+    # de-duped union in stable order: followers first, then new entries from follows.
+    union: set[int] | None = set() if args.plain else None
+    counts: dict[str, int] = {}
+
+    with atomic_text_writer(args.out) as out:
+        if not args.plain:
+            out.write(f"# bskyctl graph export\n# actor: {actor}\n# exportedAt: {exported_at}\n")
+            out.write(f"# format: {mode}\n\n")
+
+        for name, fetch in sections:
+            print(f"Exporting {name} for {actor} ...")
+            if not args.plain:
+                out.write(f"[{name}]\n")
+            counts[name] = _collect_paged(
+                partial(fetch, client),
+                out,
+                union=union,
+                progress_prefix=name,
+                actor=actor,
+                limit=limit,
+                mode=mode,
+                progress_every=int(args.progress_every),
+            )
+            if not args.plain:
+                out.write("\n")
+
+    parts = [f"{name}={n}" for name, n in counts.items()]
     parts.append(f"out={args.out}")
     print("Done. " + " ".join(parts))
 
@@ -1,18 +1,19 @@
 from __future__ import annotations
 
 import sys
+from functools import partial
 
 from ..config import get_client
-from ..ratelimit import call_with_write_backoff
+from ..ratelimit import WRITE_DELETE_POINTS, call_with_write_backoff
 from .postrefs import get_viewer_refs, resolve_post_ref
 
 
 def cmd_like(args) -> None:
     client = get_client(profile=args.profile)
     try:
-        uri, cid, public_url = resolve_post_ref(client, args.post)
-        call_with_write_backoff(lambda: client.like(uri, cid))
-        print(f"Liked: {public_url or uri}")
+        ref = resolve_post_ref(client, args.post)
+        call_with_write_backoff(partial(client.like, ref.uri, ref.cid))
+        print(f"Liked: {ref.public_url or ref.uri}")
     except Exception as e:
         print(f"Like failed: {e}", file=sys.stderr)
         raise SystemExit(1)
@@ -21,13 +22,13 @@ def cmd_like(args) -> None:
 def cmd_unlike(args) -> None:
     client = get_client(profile=args.profile)
     try:
-        uri, _cid, public_url = resolve_post_ref(client, args.post)
-        like_uri, _repost_uri = get_viewer_refs(client, uri)
+        ref = resolve_post_ref(client, args.post)
+        like_uri, _repost_uri = get_viewer_refs(ref)
         if not like_uri:
             print("Not liked (nothing to undo).")
             return
-        call_with_write_backoff(lambda: client.unlike(like_uri))
-        print(f"Unliked: {public_url or uri}")
+        call_with_write_backoff(partial(client.unlike, like_uri), points=WRITE_DELETE_POINTS)
+        print(f"Unliked: {ref.public_url or ref.uri}")
     except Exception as e:
         print(f"Unlike failed: {e}", file=sys.stderr)
         raise SystemExit(1)
@@ -36,9 +37,9 @@ def cmd_unlike(args) -> None:
 def cmd_repost(args) -> None:
     client = get_client(profile=args.profile)
     try:
-        uri, cid, public_url = resolve_post_ref(client, args.post)
-        call_with_write_backoff(lambda: client.repost(uri, cid))
-        print(f"Reposted: {public_url or uri}")
+        ref = resolve_post_ref(client, args.post)
+        call_with_write_backoff(partial(client.repost, ref.uri, ref.cid))
+        print(f"Reposted: {ref.public_url or ref.uri}")
     except Exception as e:
         print(f"Repost failed: {e}", file=sys.stderr)
         raise SystemExit(1)
@@ -47,13 +48,13 @@ def cmd_repost(args) -> None:
 def cmd_unrepost(args) -> None:
     client = get_client(profile=args.profile)
     try:
-        uri, _cid, public_url = resolve_post_ref(client, args.post)
-        _like_uri, repost_uri = get_viewer_refs(client, uri)
+        ref = resolve_post_ref(client, args.post)
+        _like_uri, repost_uri = get_viewer_refs(ref)
         if not repost_uri:
             print("Not reposted (nothing to undo).")
             return
-        call_with_write_backoff(lambda: client.unrepost(repost_uri))
-        print(f"Unreposted: {public_url or uri}")
+        call_with_write_backoff(partial(client.unrepost, repost_uri), points=WRITE_DELETE_POINTS)
+        print(f"Unreposted: {ref.public_url or ref.uri}")
     except Exception as e:
         print(f"Unrepost failed: {e}", file=sys.stderr)
         raise SystemExit(1)
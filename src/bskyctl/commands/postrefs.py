@@ -1,14 +1,33 @@
 from __future__ import annotations
 
 import re
+from dataclasses import dataclass
+from functools import partial
 
 from ..ratelimit import call_with_read_backoff
+from ..resolve_cache import resolve_did
 
+# URL form: https://bsky.app/profile/<handle>/post/<rkey>
+_BSKY_URL_RE = re.compile(r"bsky\.app/profile/([^/]+)/post/([^/?#]+)")
 
-def resolve_post_ref(client, value: str) -> tuple[str, str, str | None]:
+
+@dataclass
+class PostRef:
+    uri: str
+    cid: str
+    public_url: str | None
+    # Viewer state (like/repost URIs) from the same get_posts call, if present.
+    viewer: object | None = None
+
+
+def _post_ref(post, public_url: str | None) -> PostRef:
+    return PostRef(uri=post.uri, cid=post.cid, public_url=public_url, viewer=getattr(post, "viewer", None))
+
+
+def resolve_post_ref(client, value: str) -> PostRef:
     """Resolve a post reference.
 
-    Returns: (uri, cid, public_url)
+    Returns a PostRef (uri, cid, public_url, viewer).
 
     Accepts:
     - bsky.app post URL
@@ -17,43 +36,39 @@ def resolve_post_ref(client, value: str) -> tuple[str, str, str | None]:
 
     value = value.strip()
 
-    # URL form: https://bsky.app/profile/<handle>/post/<rkey>
-    m = re.search(r"bsky\.app/profile/([^/]+)/post/([^/?#]+)", value)
+    m = _BSKY_URL_RE.search(value)
     if m:
         handle = m.group(1)
         rkey = m.group(2)
         # Resolve handle -> DID
-        did = call_with_read_backoff(lambda: client.resolve_handle(handle)).did
+        did = resolve_did(client, handle)
         uri = f"at://{did}/app.bsky.feed.post/{rkey}"
-        posts = call_with_read_backoff(lambda: client.get_posts([uri])).posts
+        posts = call_with_read_backoff(partial(client.get_posts, [uri])).posts
         if not posts:
             raise RuntimeError(
                 "Could not resolve post. Tip: paste the ORIGINAL post URL (author handle + post id)."
             )
-        post = posts[0]
         public_url = f"https://bsky.app/profile/{handle}/post/{rkey}"
-        return post.uri, post.cid, public_url
+        return _post_ref(posts[0], public_url)
 
     # at://... uri
     if value.startswith("at://"):
         uri = value
-        posts = call_with_read_backoff(lambda: client.get_posts([uri])).posts
+        posts = call_with_read_backoff(partial(client.get_posts, [uri])).posts
         if not posts:
             raise RuntimeError("Could not resolve post")
-        post = posts[0]
-        return post.uri, post.cid, None
+        return _post_ref(posts[0], None)
 
     raise RuntimeError("Unsupported post reference (use a bsky.app post URL)")
 
 
-def get_viewer_refs(client, uri: str) -> tuple[str | None, str | None]:
-    """Return (like_uri, repost_uri) for the authenticated viewer, if present."""
+def get_viewer_refs(ref: PostRef) -> tuple[str | None, str | None]:
+    """Return (like_uri, repost_uri) for the authenticated viewer, if present.
 
-    posts = call_with_read_backoff(lambda: client.get_posts([uri])).posts
-    if not posts:
-        return None, None
-    post = posts[0]
-    viewer = getattr(post, "viewer", None)
+    Reads the viewer state captured by resolve_post_ref; no extra request.
+    """
+
+    viewer = ref.viewer
     if not viewer:
         return None, None
     like_uri = getattr(viewer, "like", None)
@@ -2,66 +2,82 @@ from __future__ import annotations
 
 import re
 import sys
+from functools import partial
 
 from ..atproto_compat import require_atproto
 from ..config import get_client
-from ..ratelimit import call_with_read_backoff, call_with_write_backoff
-from ..utils import normalize_handle
+from ..ratelimit import WRITE_DELETE_POINTS, call_with_read_backoff, call_with_write_backoff
+from ..read_cache import cached_read, read_key
+from ..resolve_cache import prefetch_dids, resolve_did
+from ..utils import normalize_handle, write_json_stdout
 from .postrefs import resolve_post_ref
 
+# Bluesky clients do NOT auto-detect hashtags/mentions reliably.
+# To make #hashtags clickable/searchable we must emit proper facets.
+# One left-to-right scan; each alternative starts with a distinct character
+# ("h", "#", "@"), so a match is classified by its first char. The mention
+# class already includes ".", so no nested repetition is needed. Tag/mention
+# syntax is pure ASCII; URLs still end at any Unicode whitespace (e.g. U+3000).
+_FACET_RE = re.compile(r"https?://(?u:[^\s]+)|#[A-Za-z0-9_]+|@[A-Za-z0-9_.-]+", re.ASCII)
 
-def cmd_post(args) -> None:
-    _Client, client_utils, _models = require_atproto()
-
-    client = get_client(profile=args.profile)
-    text = args.text
-
-    # Bluesky clients do NOT auto-detect hashtags/mentions reliably.
-    # To make #hashtags clickable/searchable we must emit proper facets.
-    url_pattern = r"https?://[^\s]+"
-    tag_pattern = r"#[A-Za-z0-9_]+"
-    mention_pattern = r"@[A-Za-z0-9_.-]+(?:\.[A-Za-z0-9_.-]+)*"
 
-    token_re = re.compile(rf"({url_pattern}|{tag_pattern}|{mention_pattern})")
-    matches = list(token_re.finditer(text))
+def _build_rich_text(client, client_utils, text: str):
+    """Return a TextBuilder with link/hashtag/mention facets, or `text` if there are none."""
 
+    matches = list(_FACET_RE.finditer(text))
     if not matches:
-        response = call_with_write_backoff(lambda: client.send_post(text=text))
-    else:
-        builder = client_utils.TextBuilder()
-        last_end = 0
-
-        for match in matches:
-            if match.start() > last_end:
-                builder.text(text[last_end : match.start()])
-
-            token = match.group(1)
-
-            if re.fullmatch(url_pattern, token):
-                builder.link(token, token)
-            elif re.fullmatch(tag_pattern, token):
-                # token includes leading '#'
-                builder.tag(token, token[1:])
-            elif token.startswith("@"):  # mention
-                handle = normalize_handle(token)
-                try:
-                    did = call_with_read_backoff(lambda: client.resolve_handle(handle)).did
-                    builder.mention(token, did)
-                except Exception:
-                    # Fallback to plain text if resolution fails.
-                    builder.text(token)
-            else:
+        return text
+
+    mentions = [normalize_handle(m.group()) for m in matches if m.group()[0] == "@"]
+    if len(mentions) > 1:
+        # One getProfiles request for every uncached mention instead of one resolve each.
+        prefetch_dids(client, mentions)
+
+    builder = client_utils.TextBuilder()
+    last_end = 0
+
+    for match in matches:
+        if match.start() > last_end:
+            builder.text(text[last_end : match.start()])
+
+        token = match.group()
+        first = token[0]
+
+        if first == "h":
+            builder.link(token, token)
+        elif first == "#":
+            # token includes leading '#'
+            builder.tag(token, token[1:])
+        else:  # mention
+            handle = normalize_handle(token)
+            try:
+                did = resolve_did(client, handle)
+                builder.mention(token, did)
+            except Exception:
+                # Fallback to plain text if resolution fails.
                 builder.text(token)
 
-            last_end = match.end()
+        last_end = match.end()
 
-        if last_end < len(text):
-            builder.text(text[last_end:])
+    if last_end < len(text):
+        builder.text(text[last_end:])
 
-        response = call_with_write_backoff(lambda: client.send_post(builder))
+    return builder
+
+
+def cmd_post(args) -> None:
+    _Client, client_utils, _models = require_atproto()
+
+    client = get_client(profile=args.profile)
+    body = _build_rich_text(client, client_utils, args.text)
+
+    if isinstance(body, str):
+        response = call_with_write_backoff(partial(client.send_post, text=body))
+    else:
+        response = call_with_write_backoff(partial(client.send_post, body))
 
     uri = response.uri
-    post_id = uri.split("/")[-1]
+    post_id = uri.rpartition("/")[2]
     print(f"Posted: https://bsky.app/profile/{client.me.handle}/post/{post_id}")
 
 
@@ -70,50 +86,23 @@ def cmd_quote(args) -> None:
 
     client = get_client(profile=args.profile)
     try:
-        uri, cid, public_url = resolve_post_ref(client, args.post)
-        embed = models.AppBskyEmbedRecord.Main(record=models.ComAtprotoRepoStrongRef.Main(uri=uri, cid=cid))
-
-        # Reuse the same rich-text builder behavior as cmd_post (links + hashtags + mentions facets)
-        text = args.text
-        url_pattern = r"https?://[^\s]+"
-        tag_pattern = r"#[A-Za-z0-9_]+"
-        mention_pattern = r"@[A-Za-z0-9_.-]+(?:\.[A-Za-z0-9_.-]+)*"
-        token_re = re.compile(rf"({url_pattern}|{tag_pattern}|{mention_pattern})")
-        matches = list(token_re.finditer(text))
-
-        if not matches:
-            response = call_with_write_backoff(lambda: client.send_post(text=text, embed=embed))
+        ref = resolve_post_ref(client, args.post)
+        embed = models.AppBskyEmbedRecord.Main(
+            record=models.ComAtprotoRepoStrongRef.Main(uri=ref.uri, cid=ref.cid)
+        )
+
+        # Same rich-text builder as cmd_post (links + hashtags + mentions facets)
+        body = _build_rich_text(client, client_utils, args.text)
+
+        if isinstance(body, str):
+            response = call_with_write_backoff(partial(client.send_post, text=body, embed=embed))
         else:
-            builder = client_utils.TextBuilder()
-            last_end = 0
-            for match in matches:
-                if match.start() > last_end:
-                    builder.text(text[last_end : match.start()])
-
-                token = match.group(1)
-                if re.fullmatch(url_pattern, token):
-                    builder.link(token, token)
-                elif re.fullmatch(tag_pattern, token):
-                    builder.tag(token, token[1:])
-                elif token.startswith("@"):  # mention
-                    handle = normalize_handle(token)
-                    try:
-                        did = call_with_read_backoff(lambda: client.resolve_handle(handle)).did
-                        builder.mention(token, did)
-                    except Exception:
-                        builder.text(token)
-                else:
-                    builder.text(token)
-                last_end = match.end()
-            if last_end < len(text):
-                builder.text(text[last_end:])
-
-            response = call_with_write_backoff(lambda: client.send_post(builder, embed=embed))
-
-        post_id = response.uri.split("/")[-1]
+            response = call_with_write_backoff(partial(client.send_post, body, embed=embed))
+
+        post_id = response.uri.rpartition("/")[2]
         print(f"Quoted: https://bsky.app/profile/{client.me.handle}/post/{post_id}")
-        if public_url:
-            print(f"  ↳ original: {public_url}")
+        if ref.public_url:
+            print(f"  ↳ original: {ref.public_url}")
     except Exception as e:
         print(f"Quote failed: {e}", file=sys.stderr)
         raise SystemExit(1)
@@ -124,14 +113,14 @@ def cmd_delete(args) -> None:
 
     # Extract post ID from URL or use raw ID
     post_id = args.post_id
-    if "bsky.app" in post_id:
-        post_id = post_id.rstrip("/").split("/")[-1]
+    if post_id.startswith(("https://", "http://", "bsky.app/")):
+        post_id = post_id.rstrip("/").rpartition("/")[2]
 
     # Construct the URI
     uri = f"at://{client.me.did}/app.bsky.feed.post/{post_id}"
 
     try:
-        call_with_write_backoff(lambda: client.delete_post(uri))
+        call_with_write_backoff(partial(client.delete_post, uri), points=WRITE_DELETE_POINTS)
         print(f"Deleted post: {post_id}")
     except Exception as e:
         print(f"Delete failed: {e}", file=sys.stderr)
@@ -139,14 +128,29 @@ def cmd_delete(args) -> None:
 
 
 def cmd_profile(args) -> None:
-    client = get_client(profile=args.profile)
-    handle = args.handle.lstrip("@") if args.handle else client.me.handle
+    _Client, _client_utils, models = require_atproto()
+
+    def fetch():
+        client = get_client(profile=args.profile)
+        h = args.handle
+        handle = (h[1:] if h and h[0] == "@" else h) or client.me.handle
+
+        # Auto-append .bsky.social if no domain specified
+        if handle and "." not in handle:
+            handle += ".bsky.social"
+
+        return call_with_read_backoff(partial(client.get_profile, handle))
 
-    # Auto-append .bsky.social if no domain specified
-    if handle and "." not in handle:
-        handle = f"{handle}.bsky.social"
+    profile = cached_read(
+        read_key(args, "profile", args.handle),
+        args.cache_ttl,
+        models.AppBskyActorDefs.ProfileViewDetailed,
+        fetch,
+    )
+    if args.json:
+        write_json_stdout(profile)
+        return
 
-    profile = call_with_read_backoff(lambda: client.get_profile(handle))
     print(f"@{profile.handle}")
     print(f"  Name: {profile.display_name or '(none)'}")
     print(f"  Bio: {profile.description or '(none)'}")
@@ -1,24 +1,180 @@
 from __future__ import annotations
 
-import random
 import sys
-import time
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
 
 from ..config import get_client
-from ..ratelimit import is_already_exists, is_rate_limited, throttle_req
+from ..ratelimit import (
+    REQ_BURST,
+    REQ_RPS,
+    WRITE_CREATE_POINTS,
+    WRITE_DELETE_POINTS,
+    AdaptiveBackoff,
+    PrepaidTokens,
+    is_already_exists,
+    is_rate_limited,
+    throttle_write,
+)
+from ..resolve_cache import cached_did, prefetch_dids, remember_did
 from ..utils import (
-    append_line,
+    BufferedLogWriter,
     atomic_write_lines,
+    iter_actor_lines,
     normalize_handle,
     read_actor_lines,
     rewrite_list_file,
     sleep_between,
 )
 
+# Requests are I/O bound, so a few workers let resolve/follow round trips
+# overlap. Pacing still comes from --min-delay/--max-delay and the shared bucket.
+# Upper bound and default for --concurrency.
+_MAX_WORKERS = 8
+_WORKERS = max(1, min(_MAX_WORKERS, int(REQ_RPS)))
 
-def cmd_follow(args) -> None:
-    client = get_client(profile=args.profile)
 
+def _drain(in_flight: deque, *, keep: int):
+    # Yield finished results from the head of the window, blocking while more
+    # than `keep` requests are still in flight.
+    while in_flight and (len(in_flight) > keep or in_flight[0][1].done()):
+        actor, fut = in_flight.popleft()
+        yield actor, fut.result()
+
+
+def _run_ordered(actors: list[str], work, *, workers: int, min_delay: float, max_delay: float, buffer: float):
+    """Run `work(actor)` on a bounded thread pool and yield (actor, result) in input order.
+
+    Request starts are paced with sleep_between(). Results are yielded on the
+    caller's thread, so bookkeeping (printing, output files, checkpoints) never
+    races with the workers. With workers=1 this is exactly the old serial loop.
+    """
+
+    workers = max(1, workers)
+    pool = ThreadPoolExecutor(max_workers=workers)
+    in_flight: deque = deque()
+    try:
+        for i, actor in enumerate(actors):
+            if i:
+                yield from _drain(in_flight, keep=workers - 1)
+                sleep_between(min_delay, max_delay, buffer)
+            yield from _drain(in_flight, keep=workers - 1)
+            in_flight.append((actor, pool.submit(work, actor)))
+
+        yield from _drain(in_flight, keep=0)
+    except BaseException:
+        # Interrupted (or the caller stopped iterating): don't wait for
+        # in-flight workers, one may be sleeping off a 429 for minutes. The
+        # caller checkpoints right away and cancels the backoff.
+        pool.shutdown(wait=False, cancel_futures=True)
+        raise
+    pool.shutdown(wait=True)
+
+
+class _CheckpointWriter:
+    """Write `remaining` snapshots to the checkpoint files from a background thread.
+
+    Only the newest pending snapshot is kept, so a slow disk never stalls the
+    request loop and never gets a backlog of stale rewrites.
+    """
+
+    def __init__(self, paths: list[str]):
+        self.paths = paths
+        self._cond = threading.Condition()
+        self._latest: list[str] | None = None
+        self._closed = False
+        self._error: BaseException | None = None
+        self._thread = threading.Thread(target=self._run, name="bskyctl-checkpoint", daemon=True)
+        if self.paths:
+            self._thread.start()
+
+    def post(self, snapshot: list[str]) -> None:
+        if not self.paths:
+            return
+        with self._cond:
+            self._latest = snapshot
+            self._cond.notify()
+
+    def close(self) -> None:
+        """Write the last posted snapshot (if any) and stop the writer thread."""
+
+        if not self.paths:
+            return
+        with self._cond:
+            self._closed = True
+            self._cond.notify()
+        self._thread.join()
+        if self._error is not None:
+            raise self._error
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                while self._latest is None and not self._closed:
+                    self._cond.wait()
+                snapshot, self._latest = self._latest, None
+            if snapshot is None:
+                return
+            try:
+                for path in self.paths:
+                    atomic_write_lines(path, snapshot)
+            except BaseException as e:
+                self._error = e
+                return
+
+
+def _follow_actor(client, actor: str, tokens: PrepaidTokens) -> str:
+    if actor.startswith("did:"):
+        did = actor
+    else:
+        # cache handle -> did to cut resolve requests
+        did = cached_did(actor)
+        if not did:
+            tokens.take()
+            did = client.resolve_handle(actor).did
+            remember_did(actor, did)
+
+    tokens.take()
+    throttle_write(WRITE_CREATE_POINTS)
+    client.follow(did)
+    return "ok"
+
+
+def _unfollow_actor(client, actor: str, tokens: PrepaidTokens) -> str:
+    tokens.take()
+    profile = client.get_profile(actor)
+    viewer = getattr(profile, "viewer", None)
+    follow_uri = getattr(viewer, "following", None) if viewer else None
+    if not follow_uri:
+        return "skipped"
+
+    tokens.take()
+    throttle_write(WRITE_DELETE_POINTS)
+    client.unfollow(follow_uri)
+    return "ok"
+
+
+def _run_actor_loop(
+    client,
+    args,
+    *,
+    verb: str,
+    action,
+    already_done=None,
+    prepare=None,
+    ok_label: str,
+    skip_label: str,
+    out_ok: str,
+) -> None:
+    """Shared driver for follow/unfollow over one actor or a --list file.
+
+    `action(client, actor, tokens)` returns "ok" or "skipped" and raises on
+    failure; errors matching `already_done` count as skipped.
+    """
+
+    failed_label = f"{verb.capitalize()} failed"
     try:
         actors: list[str]
         list_path = getattr(args, "list", None)
@@ -29,112 +185,143 @@ def cmd_follow(args) -> None:
         else:
             raise RuntimeError("Missing actor. Provide a handle/DID or use --list <file>.")
 
+        processed_log = getattr(args, "processed_log", None)
+        if getattr(args, "resume", False):
+            if not processed_log:
+                raise RuntimeError("--resume needs --processed-log.")
+            if Path(processed_log).expanduser().exists():
+                done = set(map(normalize_handle, iter_actor_lines(processed_log)))
+                actors = [a for a in actors if normalize_handle(a) not in done]
+
         max_n = args.max if getattr(args, "max", None) else None
         if max_n is not None:
             actors = actors[: int(max_n)]
 
         # Normalize + de-dupe AFTER normalization (so '@x' and 'x' collapse).
-        seen: set[str] = set()
-        norm_actors: list[str] = []
-        for raw in actors:
-            a = normalize_handle(raw)
-            if a in seen:
-                continue
-            seen.add(a)
-            norm_actors.append(a)
-        actors = norm_actors
-
-        # cache handle -> did to cut resolve requests
-        did_cache: dict[str, str] = {}
+        actors = list(dict.fromkeys(map(normalize_handle, actors)))
 
         ok: list[str] = []
         skipped: list[str] = []
         failed: list[str] = []
 
-        remaining = actors.copy()
+        remaining = deque(actors)
+
+        # Up to two requests per actor; pull tokens from the shared bucket in batches.
+        tokens = PrepaidTokens(batch=min(REQ_BURST, 2 * len(actors)))
+
+        if prepare is not None and not args.dry_run:
+            prepare(actors)
+
+        checkpoint_paths = [list_path] if args.inplace and list_path else []
+        if args.out_remaining:
+            checkpoint_paths.append(args.out_remaining)
+        checkpoints = _CheckpointWriter(checkpoint_paths)
+
+        # Snapshot `remaining` every N handled actors (and on exit/interrupt);
+        # an abrupt kill in between only means re-visiting < N actors on resume.
+        checkpoint_every = getattr(args, "checkpoint_every", None)
+        if checkpoint_every is None:
+            checkpoint_every = 25
+        elif checkpoint_every < 1:
+            raise RuntimeError("--checkpoint-every must be >= 1")
+
+        workers = getattr(args, "concurrency", None)
+        if workers is None:
+            workers = _WORKERS
+        elif workers < 1:
+            raise RuntimeError("--concurrency must be >= 1")
+        workers = 1 if args.dry_run else min(workers, _MAX_WORKERS)
+
+        # Result logs are flushed on the same cadence.
+        logs = {
+            name: BufferedLogWriter(path, flush_every=checkpoint_every)
+            for name, path in (
+                ("ok", out_ok),
+                ("skipped", args.out_skipped),
+                ("failed", args.out_failed),
+                ("processed", processed_log),
+            )
+        }
 
         def checkpoint() -> None:
-            if args.inplace and list_path:
-                rewrite_list_file(list_path, remaining)
-            atomic_write_lines(args.out_remaining, remaining) if args.out_remaining else None
+            for log in logs.values():
+                log.flush()
+            if checkpoint_paths:
+                checkpoints.post(list(remaining))
+
+        backoff = AdaptiveBackoff()
+
+        def run_one(actor: str) -> tuple[str, str]:
+            if args.dry_run:
+                return "ok", ""
+
+            attempt = 0
+            while True:
+                try:
+                    return action(client, actor, tokens), ""
+                except Exception as e:
+                    if already_done is not None and already_done(e):
+                        return "skipped", ""
+                    if is_rate_limited(e) and attempt < 2:
+                        backoff.wait_after_429(e, buffer=args.buffer)
+                        if backoff.cancelled:
+                            return "failed", "interrupted"
+                        attempt += 1
+                        continue
+                    return "failed", str(e)
 
         try:
+            # Keep each actor in `remaining` until it is handled, so an abrupt
+            # abort leaves the list file pointing at the true remainder.
             processed = 0
-            while remaining:
-                # Keep the current actor in `remaining` until it is successfully handled,
-                # so an abrupt abort leaves the list file pointing at the true remainder.
-                actor = remaining[0]
-                idx = processed + 1
+            for actor, (status, msg) in _run_ordered(
+                actors,
+                run_one,
+                workers=workers,
+                min_delay=args.min_delay,
+                max_delay=args.max_delay,
+                buffer=args.buffer,
+            ):
+                processed += 1
+                idx = processed
+                remaining.popleft()
 
                 if args.dry_run:
-                    print(f"DRY RUN follow: {actor}")
+                    print(f"DRY RUN {verb}: {actor}")
                     ok.append(actor)
-                    append_line(args.out_followed, actor)
-                    remaining.pop(0)
-                    processed += 1
-                    checkpoint()
-                    sleep_between(args.min_delay, args.max_delay, args.buffer)
-                    continue
-
-                attempt = 0
-                handled = False
-                while True:
-                    try:
-                        if actor.startswith("did:"):
-                            did = actor
-                        else:
-                            did = did_cache.get(actor)
-                            if not did:
-                                throttle_req(1.0)
-                                did = client.resolve_handle(actor).did
-                                did_cache[actor] = did
-
-                        throttle_req(1.0)
-                        client.follow(did)
-                        print(f"Followed ({idx}/{len(actors)}): {actor}")
-                        ok.append(actor)
-                        append_line(args.out_followed, actor)
-                        # success => remove from queue
-                        remaining.pop(0)
-                        processed += 1
-                        handled = True
-                        break
-                    except Exception as e:
-                        if is_already_exists(e):
-                            print(f"Already following ({idx}/{len(actors)}): {actor}")
-                            skipped.append(actor)
-                            append_line(args.out_skipped, actor)
-                            remaining.pop(0)
-                            processed += 1
-                            handled = True
-                            break
-
-                        if is_rate_limited(e) and attempt < 2:
-                            wait_s = random.uniform(20, 40) * (1.0 + float(args.buffer))
-                            print(f"Rate limited; backing off {wait_s:.1f}s ...", file=sys.stderr)
-                            time.sleep(wait_s)
-                            attempt += 1
-                            continue
-
-                        msg = str(e)
-                        print(f"Follow failed ({idx}/{len(actors)}): {actor} :: {msg}", file=sys.stderr)
-                        failed.append(actor)
-                        append_line(args.out_failed, actor)
-                        # failure => move to end (so we still progress)
-                        remaining.pop(0)
-                        remaining.append(actor)
-                        processed += 1
-                        handled = True
-                        break
-
-                if handled:
+                    logs["ok"].write(actor)
+                elif status == "ok":
+                    print(f"{ok_label} ({idx}/{len(actors)}): {actor}")
+                    ok.append(actor)
+                    logs["ok"].write(actor)
+                    logs["processed"].write(actor)
+                elif status == "skipped":
+                    print(f"{skip_label} ({idx}/{len(actors)}): {actor}")
+                    skipped.append(actor)
+                    logs["skipped"].write(actor)
+                    logs["processed"].write(actor)
+                else:
+                    print(f"{failed_label} ({idx}/{len(actors)}): {actor} :: {msg}", file=sys.stderr)
+                    failed.append(actor)
+                    logs["failed"].write(actor)
+                    # failure => move to end (so a resume retries it last)
+                    remaining.append(actor)
+
+                if processed % checkpoint_every == 0:
                     checkpoint()
-                sleep_between(args.min_delay, args.max_delay, args.buffer)
+
+            checkpoint()
 
         except KeyboardInterrupt:
+            backoff.cancel()
             print("Interrupted. Writing remaining list for resume...", file=sys.stderr)
             checkpoint()
             raise
+        finally:
+            tokens.close()
+            for log in logs.values():
+                log.close()
+            checkpoints.close()
 
         if args.rewrite_input and list_path and not args.inplace:
             # Keep only failures by default so a rerun targets what didn't work.
@@ -142,122 +329,36 @@ def cmd_follow(args) -> None:
         elif args.rewrite_input and args.inplace:
             print("Note: --rewrite-input ignored when --inplace is set.", file=sys.stderr)
 
-        print(f"Done. followed={len(ok)} skipped={len(skipped)} failed={len(failed)}")
+        print(f"Done. {ok_label.lower()}={len(ok)} skipped={len(skipped)} failed={len(failed)}")
     except Exception as e:
-        print(f"Follow failed: {e}", file=sys.stderr)
+        print(f"{failed_label}: {e}", file=sys.stderr)
         raise SystemExit(1)
 
 
-def cmd_unfollow(args) -> None:
+def cmd_follow(args) -> None:
     client = get_client(profile=args.profile)
+    _run_actor_loop(
+        client,
+        args,
+        verb="follow",
+        action=_follow_actor,
+        already_done=is_already_exists,
+        # Resolve handles 25 at a time up front instead of one request per actor.
+        prepare=lambda actors: prefetch_dids(client, actors),
+        ok_label="Followed",
+        skip_label="Already following",
+        out_ok=args.out_followed,
+    )
 
-    try:
-        actors: list[str]
-        list_path = getattr(args, "list", None)
-        if list_path:
-            actors = read_actor_lines(list_path)
-        elif args.actor:
-            actors = [args.actor]
-        else:
-            raise RuntimeError("Missing actor. Provide a handle/DID or use --list <file>.")
-
-        max_n = args.max if getattr(args, "max", None) else None
-        if max_n is not None:
-            actors = actors[: int(max_n)]
-
-        # Normalize + de-dupe AFTER normalization (so '@x' and 'x' collapse).
-        seen: set[str] = set()
-        norm_actors: list[str] = []
-        for raw in actors:
-            a = normalize_handle(raw)
-            if a in seen:
-                continue
-            seen.add(a)
-            norm_actors.append(a)
-        actors = norm_actors
-
-        ok: list[str] = []
-        skipped: list[str] = []
-        failed: list[str] = []
-
-        remaining = actors.copy()
-
-        def checkpoint() -> None:
-            if args.inplace and list_path:
-                rewrite_list_file(list_path, remaining)
-            atomic_write_lines(args.out_remaining, remaining) if args.out_remaining else None
-
-        try:
-            processed = 0
-            while remaining:
-                actor = remaining[0]
-                idx = processed + 1
 
-                if args.dry_run:
-                    print(f"DRY RUN unfollow: {actor}")
-                    ok.append(actor)
-                    append_line(args.out_unfollowed, actor)
-                    remaining.pop(0)
-                    processed += 1
-                    checkpoint()
-                    sleep_between(args.min_delay, args.max_delay, args.buffer)
-                    continue
-
-                attempt = 0
-                handled = False
-                while True:
-                    try:
-                        throttle_req(1.0)
-                        profile = client.get_profile(actor)
-                        viewer = getattr(profile, "viewer", None)
-                        follow_uri = getattr(viewer, "following", None) if viewer else None
-                        if not follow_uri:
-                            print(f"Not following ({idx}/{len(actors)}): {actor}")
-                            skipped.append(actor)
-                            append_line(args.out_skipped, actor)
-                        else:
-                            throttle_req(1.0)
-                            client.unfollow(follow_uri)
-                            print(f"Unfollowed ({idx}/{len(actors)}): {actor}")
-                            ok.append(actor)
-                            append_line(args.out_unfollowed, actor)
-
-                        remaining.pop(0)
-                        processed += 1
-                        handled = True
-                        break
-                    except Exception as e:
-                        if is_rate_limited(e) and attempt < 2:
-                            wait_s = random.uniform(20, 40) * (1.0 + float(args.buffer))
-                            print(f"Rate limited; backing off {wait_s:.1f}s ...", file=sys.stderr)
-                            time.sleep(wait_s)
-                            attempt += 1
-                            continue
-                        msg = str(e)
-                        print(f"Unfollow failed ({idx}/{len(actors)}): {actor} :: {msg}", file=sys.stderr)
-                        failed.append(actor)
-                        append_line(args.out_failed, actor)
-                        remaining.pop(0)
-                        remaining.append(actor)
-                        processed += 1
-                        handled = True
-                        break
-
-                if handled:
-                    checkpoint()
-                sleep_between(args.min_delay, args.max_delay, args.buffer)
-
-        except KeyboardInterrupt:
-            print("Interrupted. Writing remaining list for resume...", file=sys.stderr)
-            checkpoint()
-            raise
-
-        if args.rewrite_input and list_path and not args.inplace:
-            rewrite_list_file(list_path, failed)
-        elif args.rewrite_input and args.inplace:
-            print("Note: --rewrite-input ignored when --inplace is set.", file=sys.stderr)
-
-        print(f"Done. unfollowed={len(ok)} skipped={len(skipped)} failed={len(failed)}")
-    except Exception as e:
-        print(f"Unfollow failed: {e}", file=sys.stderr)
-        raise SystemExit(1)
+def cmd_unfollow(args) -> None:
+    client = get_client(profile=args.profile)
+    _run_actor_loop(
+        client,
+        args,
+        verb="unfollow",
+        action=_unfollow_actor,
+        ok_label="Unfollowed",
+        skip_label="Not following",
+        out_ok=args.out_unfollowed,
+    )
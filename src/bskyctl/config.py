@@ -1,11 +1,13 @@
 from __future__ import annotations
 
-import json
+import functools
 import os
 import sys
 from pathlib import Path
 
 from .atproto_compat import require_atproto
+from .ratelimit import CACHE_DIR, set_write_account
+from .utils import json_dumps, json_loads, temp_path_for
 
 CONFIG_PATH = Path.home() / ".config" / "bsky" / "config.json"
 
@@ -13,7 +15,7 @@ CONFIG_PATH = Path.home() / ".config" / "bsky" / "config.json"
 def load_config() -> dict:
     if CONFIG_PATH.exists():
         try:
-            cfg = json.loads(CONFIG_PATH.read_text())
+            cfg = json_loads(CONFIG_PATH.read_bytes())
         except Exception:
             return {"profiles": {}, "active": None}
     else:
@@ -38,9 +40,28 @@ def load_config() -> dict:
     return cfg
 
 
+@functools.lru_cache(maxsize=1)
+def load_config_cached() -> dict:
+    """load_config() memoized for the rest of the process; treat the result as read-only.
+
+    Use plain load_config() when you intend to modify and save the config.
+    """
+
+    return load_config()
+
+
 def save_config(config: dict) -> None:
+    # Write-then-rename so a crash or a concurrent `bskyctl` never sees a
+    # truncated file; 0600 because profiles hold app passwords.
     CONFIG_PATH.parent.mkdir(parents=True, exist_ok=True)
-    CONFIG_PATH.write_text(json.dumps(config, indent=2))
+    tmp = temp_path_for(CONFIG_PATH)
+    fd = os.open(tmp, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+    with os.fdopen(fd, "wb") as f:
+        f.write(json_dumps(config, pretty=True))
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, CONFIG_PATH)
+    load_config_cached.cache_clear()
 
 
 def resolve_profile(cfg: dict, *, profile: str | None) -> tuple[str, dict]:
@@ -58,10 +79,62 @@ def resolve_profile(cfg: dict, *, profile: str | None) -> tuple[str, dict]:
     return profile_name, profiles[profile_name]
 
 
+def session_path(profile_name: str) -> Path:
+    return CACHE_DIR / f"session-{profile_name}.txt"
+
+
+def save_session(profile_name: str, client) -> None:
+    """Persist the client's session (access + refresh JWT) for reuse; best effort."""
+
+    try:
+        session = client.export_session_string()
+    except Exception:
+        return
+
+    path = session_path(profile_name)
+    tmp = temp_path_for(path)
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd = os.open(tmp, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            f.write(session)
+        os.replace(tmp, path)
+    except Exception:
+        pass
+
+
+def delete_session(profile_name: str) -> None:
+    try:
+        session_path(profile_name).unlink()
+    except FileNotFoundError:
+        pass
+
+
+def _login_from_session(client, profile_name: str, p: dict) -> bool:
+    # Reusing a saved session skips createSession (a round trip, and rate
+    # limited per account); the SDK refreshes an expired access token itself.
+    try:
+        session = session_path(profile_name).read_text(encoding="utf-8").strip()
+    except Exception:
+        return False
+    if not session:
+        return False
+
+    try:
+        client.login(session_string=session)
+    except Exception:
+        return False
+
+    me = getattr(client, "me", None)
+    if me is None or (p.get("did") and me.did != p["did"]):
+        return False
+    return True
+
+
 def get_client(*, profile: str | None = None):
     Client, _client_utils, _models = require_atproto()
 
-    cfg = load_config()
+    cfg = load_config_cached()
     try:
         profile_name, p = resolve_profile(cfg, profile=profile)
     except Exception:
@@ -84,5 +157,17 @@ def get_client(*, profile: str | None = None):
         raise SystemExit(1)
 
     client = Client()
-    client.login(p["handle"], p["app_password"])
+    if not _login_from_session(client, profile_name, p):
+        client = Client()
+        client.login(p["handle"], p["app_password"])
+        save_session(profile_name, client)
+
+    me = getattr(client, "me", None)
+    set_write_account(getattr(me, "did", None) or p.get("did") or profile_name)
+
+    # Keep the saved session current when the SDK refreshes tokens.
+    on_session_change = getattr(client, "on_session_change", None)
+    if on_session_change is not None:
+        on_session_change(lambda _event, _session: save_session(profile_name, client))
+
     return client
@@ -1,10 +1,16 @@
 from __future__ import annotations
 
-import json
+import functools
+import math
+import mmap
 import os
 import random
+import re
+import struct
 import sys
+import threading
 import time
+from collections import deque
 from pathlib import Path
 
 try:
@@ -12,22 +18,62 @@ try:
 except Exception:  # pragma: no cover
     fcntl = None
 
-from .utils import atomic_write_json
-
 CACHE_DIR = Path.home() / ".cache" / "bsky"
-RATE_STATE_DIR = CACHE_DIR / "ratelimit"
+
+
+def _rate_state_dir() -> Path:
+    # Prefer tmpfs: the mmap'ed bucket state then lives purely in shared
+    # memory and is never written back to disk. Per-user, since /dev/shm is
+    # world-writable.
+    shm = Path("/dev/shm")
+    if hasattr(os, "getuid") and shm.is_dir() and os.access(shm, os.W_OK):
+        d = shm / f"bskyctl-{os.getuid()}"
+        try:
+            if d.stat().st_uid == os.getuid():
+                return d
+        except FileNotFoundError:
+            return d
+        except OSError:
+            pass
+    return CACHE_DIR / "ratelimit"
+
+
+RATE_STATE_DIR = _rate_state_dir()
 
 # Client-side throttling (helps when running multiple CLI calls in parallel).
 # Defaults are conservative vs the hosted PDS limit (3000 requests / 5 minutes).
 REQ_RPS = float(os.getenv("BSKY_REQ_RPS", "8"))  # tokens/sec
 REQ_BURST = float(os.getenv("BSKY_REQ_BURST", "16"))  # max accumulated tokens
 
+# Repo writes have their own, much smaller budget on the hosted PDS: 5000
+# points/hour per account, where a create costs 3 points and a delete 1.
+WRITE_PPS = float(os.getenv("BSKY_WRITE_PPS", str(5000 / 3600)))  # points/sec
+WRITE_BURST = float(os.getenv("BSKY_WRITE_BURST", "100"))  # max accumulated points
+WRITE_CREATE_POINTS = 3.0
+WRITE_DELETE_POINTS = 1.0
+
+# At or above this rate the bucket can never make a caller wait, so skip it
+# (and its flock/mmap round-trip) entirely.
+_UNCAPPED_RPS = 1e6
+
 _THROTTLE_ENABLED = True
+_THROTTLE_ACTIVE = REQ_RPS < _UNCAPPED_RPS
+
+# Bucket state is (tokens: double, updated: int64 CLOCK_MONOTONIC ns) in a tiny
+# mmap'ed file. The monotonic clock is system-wide, so processes can share it,
+# and it cannot jump backwards like time.time(). A zero-filled (new) file reads
+# as "updated at boot", i.e. a full bucket. A timestamp in the future can only
+# come from an earlier boot (or an old file layout), so it is treated as full.
+_STATE = struct.Struct("=dq")
+
+# Longest single sleep inside acquire(); longer waits re-check the bucket.
+_MAX_SLEEP_S = 30.0
 
 
 def set_throttle_enabled(enabled: bool) -> None:
-    global _THROTTLE_ENABLED
+    global _THROTTLE_ENABLED, _THROTTLE_ACTIVE
     _THROTTLE_ENABLED = bool(enabled)
+    _THROTTLE_ACTIVE = _THROTTLE_ENABLED and REQ_RPS < _UNCAPPED_RPS
 
 
 class SharedTokenBucket:
@@ -37,21 +83,49 @@ class SharedTokenBucket:
     invocations in parallel (e.g. many `bskyctl search ...` calls).
 
     Uses flock when available; otherwise falls back to per-process throttling.
+    The shared state is updated in place through mmap (no JSON, no temp file,
+    no rename), on tmpfs where the platform has one. The fd and mapping are
+    opened once per process, so an acquire costs a flock/unlock pair plus two
+    16-byte memory ops. Batching several tokens per round-trip is left to
+    PrepaidTokens, which gives what it doesn't spend back through release().
     """
 
     def __init__(self, *, key: str, refill_per_s: float, capacity: float):
         self.key = key
         self.refill_per_s = max(0.001, float(refill_per_s))
         self.capacity = max(1.0, float(capacity))
-        RATE_STATE_DIR.mkdir(parents=True, exist_ok=True)
-        self.state_path = RATE_STATE_DIR / f"{key}.json"
-        self.lock_path = RATE_STATE_DIR / f"{key}.lock"
+        # Deepest the balance may be booked into debt: one burst, and never
+        # more than _MAX_SLEEP_S of refill, so a process killed mid-sleep
+        # strands at most that much for everyone else.
+        self._max_debt = min(self.capacity, _MAX_SLEEP_S * self.refill_per_s)
+        RATE_STATE_DIR.mkdir(mode=0o700, parents=True, exist_ok=True)
+        self.state_path = RATE_STATE_DIR / f"{key}.state"
         self._local_tokens = self.capacity
-        self._local_updated = time.time()
+        self._local_updated = time.monotonic_ns()
+        self._local_lock = threading.Lock()
+        # flock does not exclude threads sharing one fd; this lock does.
+        self._lock = threading.Lock()
+        self._fd: int | None = None
+        self._mm: mmap.mmap | None = None
+
+    def _state(self) -> tuple[int, mmap.mmap]:
+        if self._mm is None:
+            fd = os.open(self.state_path, os.O_RDWR | os.O_CREAT, 0o600)
+            try:
+                if os.fstat(fd).st_size < _STATE.size:
+                    os.ftruncate(fd, _STATE.size)
+                self._mm = mmap.mmap(fd, _STATE.size)
+            except BaseException:
+                os.close(fd)
+                raise
+            self._fd = fd
+        return self._fd, self._mm
 
     def acquire(self, tokens: float = 1.0) -> None:
         if tokens <= 0:
             return
+        # More than one burst could never be granted.
+        tokens = min(float(tokens), self.capacity)
 
         # No flock? -> simple local token bucket.
         if fcntl is None:
@@ -59,50 +133,90 @@ class SharedTokenBucket:
             return
 
         while True:
-            now = time.time()
-            with self.lock_path.open("a+") as lockf:
-                fcntl.flock(lockf.fileno(), fcntl.LOCK_EX)
-                state = {"tokens": self.capacity, "updated": now}
-                if self.state_path.exists():
-                    try:
-                        state = json.loads(self.state_path.read_text(encoding="utf-8"))
-                    except Exception:
-                        state = {"tokens": self.capacity, "updated": now}
-
-                prev_tokens = float(state.get("tokens", self.capacity))
-                prev_updated = float(state.get("updated", now))
-                dt = max(0.0, now - prev_updated)
-                avail = min(self.capacity, prev_tokens + dt * self.refill_per_s)
-
-                if avail >= tokens:
-                    new_state = {"tokens": avail - tokens, "updated": now}
-                    atomic_write_json(self.state_path, new_state)
-                    fcntl.flock(lockf.fileno(), fcntl.LOCK_UN)
-                    return
-
-                # Not enough tokens yet.
-                needed = tokens - avail
-                wait_s = needed / self.refill_per_s
-                new_state = {"tokens": avail, "updated": now}
-                atomic_write_json(self.state_path, new_state)
-                fcntl.flock(lockf.fileno(), fcntl.LOCK_UN)
-
-            time.sleep(min(2.0, max(0.01, wait_s)))
+            booked = False
+            with self._lock:
+                fd, mm = self._state()
+                fcntl.flock(fd, fcntl.LOCK_EX)
+                try:
+                    avail, now = self._read_avail(mm)
+                    if tokens - avail <= self._max_debt:
+                        # Book the tokens even if they aren't there yet (the
+                        # balance goes negative, so later callers queue up
+                        # behind us) and sleep any deficit off once.
+                        grant = tokens
+                        wait_s = max(0.0, tokens - avail) / self.refill_per_s
+                        booked = True
+                    else:
+                        # Too deep in debt to book more; wait until we could.
+                        grant = 0.0
+                        wait_s = (tokens - avail - self._max_debt) / self.refill_per_s
+                    _STATE.pack_into(mm, 0, avail - grant, now)
+                finally:
+                    fcntl.flock(fd, fcntl.LOCK_UN)
+
+            if booked:
+                if wait_s > 0:
+                    time.sleep(wait_s)
+                return
+            time.sleep(min(_MAX_SLEEP_S, max(0.01, wait_s)))
+
+    def _read_avail(self, mm: mmap.mmap) -> tuple[float, int]:
+        # Caller holds the flock.
+        now = time.monotonic_ns()
+        prev_tokens, prev_updated = _STATE.unpack_from(mm)
+        if not math.isfinite(prev_tokens) or prev_updated > now:
+            prev_tokens, prev_updated = self.capacity, now
+
+        dt = (now - prev_updated) / 1e9
+        return min(self.capacity, prev_tokens + dt * self.refill_per_s), now
+
+    def release(self, tokens: float) -> None:
+        """Give back `tokens` that were acquired but not spent (best effort)."""
+
+        if tokens <= 0:
+            return
+        if fcntl is None:
+            with self._local_lock:
+                self._local_tokens = min(self.capacity, self._local_tokens + tokens)
+            return
+        with self._lock:
+            self._release_shared(tokens)
+
+    def _release_shared(self, tokens: float) -> None:
+        # Caller holds self._lock.
+        if self._mm is None:
+            return
+        try:
+            fcntl.flock(self._fd, fcntl.LOCK_EX)
+            try:
+                avail, now = self._read_avail(self._mm)
+                _STATE.pack_into(self._mm, 0, min(self.capacity, avail + tokens), now)
+            finally:
+                fcntl.flock(self._fd, fcntl.LOCK_UN)
+        except Exception:
+            pass
 
     def _acquire_local(self, tokens: float) -> None:
         while True:
-            now = time.time()
-            dt = max(0.0, now - self._local_updated)
-            self._local_tokens = min(self.capacity, self._local_tokens + dt * self.refill_per_s)
-            self._local_updated = now
-            if self._local_tokens >= tokens:
-                self._local_tokens -= tokens
-                return
-            wait_s = (tokens - self._local_tokens) / self.refill_per_s
-            time.sleep(min(2.0, max(0.01, wait_s)))
+            with self._local_lock:
+                now = time.monotonic_ns()
+                dt = (now - self._local_updated) / 1e9
+                avail = min(self.capacity, self._local_tokens + dt * self.refill_per_s)
+                self._local_updated = now
+                if tokens - avail <= self._max_debt:
+                    self._local_tokens = avail - tokens
+                    break
+                self._local_tokens = avail
+                wait_s = (tokens - avail - self._max_debt) / self.refill_per_s
+            time.sleep(min(_MAX_SLEEP_S, max(0.01, wait_s)))
+        if avail < tokens:
+            time.sleep((tokens - avail) / self.refill_per_s)
 
 
 _REQ_BUCKET: SharedTokenBucket | None = None
+# Write budgets are per account, so each account gets its own bucket.
+_WRITE_BUCKETS: dict[str, SharedTokenBucket] = {}
+_WRITE_ACCOUNT: str | None = None
 
 
 def _get_req_bucket() -> SharedTokenBucket:
@@ -113,63 +227,294 @@ def _get_req_bucket() -> SharedTokenBucket:
 
 
 def throttle_req(tokens: float = 1.0) -> None:
-    if not _THROTTLE_ENABLED:
+    if not _THROTTLE_ACTIVE:
         return
     _get_req_bucket().acquire(tokens)
 
 
-def call_with_read_backoff(fn, *, attempts: int = 3):
-    """Generic wrapper for read-ish calls: throttle + retry on 429."""
+def set_write_account(account: str | None) -> None:
+    """Charge later writes to `account` (a DID); get_client calls this after login."""
 
-    throttle_req(1.0)
-    attempt = 0
-    while True:
-        try:
-            return fn()
-        except Exception as e:
-            if is_rate_limited(e) and attempt < max(0, int(attempts) - 1):
-                wait_s = random.uniform(2.0, 5.0) * (2**attempt)
-                time.sleep(wait_s)
-                attempt += 1
-                continue
-            raise
+    global _WRITE_ACCOUNT
+    _WRITE_ACCOUNT = account or None
 
 
-def call_with_write_backoff(fn, *, attempts: int = 3):
-    """Generic wrapper for write-ish calls: throttle + longer retry on 429."""
+def _get_write_bucket() -> SharedTokenBucket:
+    account = _WRITE_ACCOUNT or ""
+    bucket = _WRITE_BUCKETS.get(account)
+    if bucket is None:
+        key = "write-" + re.sub(r"[^A-Za-z0-9._-]", "_", account) if account else "write"
+        bucket = _WRITE_BUCKETS[account] = SharedTokenBucket(
+            key=key, refill_per_s=WRITE_PPS, capacity=WRITE_BURST
+        )
+    return bucket
 
-    throttle_req(1.0)
+
+def throttle_write(points: float = WRITE_CREATE_POINTS) -> None:
+    """Wait for `points` of the per-account write budget (separate from the request bucket)."""
+
+    if not _THROTTLE_ENABLED or WRITE_PPS >= _UNCAPPED_RPS:
+        return
+    bucket = _get_write_bucket()
+    bucket.acquire(min(float(points), bucket.capacity))
+
+
+def throttle_req_batch(tokens: float) -> float:
+    """Acquire up to `tokens` in one bucket round-trip (capped at the burst size).
+
+    Returns the number of tokens actually granted.
+    """
+
+    if not _THROTTLE_ACTIVE:
+        return float(tokens)
+    bucket = _get_req_bucket()
+    granted = min(float(tokens), bucket.capacity)
+    bucket.acquire(granted)
+    return granted
+
+
+class PrepaidTokens:
+    """Hand out request tokens locally from batches pulled via throttle_req_batch.
+
+    Loops that throttle once or twice per item (e.g. resolve + follow) pay the
+    shared bucket's lock/IO cost once per batch instead of once per request.
+    Call close() when done so unspent tokens go back to the shared bucket.
+    """
+
+    def __init__(self, *, batch: float):
+        self.batch = max(1.0, float(batch))
+        self._tokens = 0.0
+        self._lock = threading.Lock()
+
+    def take(self, tokens: float = 1.0) -> None:
+        if not _THROTTLE_ACTIVE:
+            return
+        with self._lock:
+            if self._tokens >= tokens:
+                self._tokens -= tokens
+                return
+            short = tokens - self._tokens
+            self._tokens = 0.0
+
+        # Refill outside the lock: the bucket may sleep, and other workers
+        # should not queue up behind this one while it does.
+        extra = 0.0
+        while short > 0:
+            granted = throttle_req_batch(max(self.batch, short))
+            used = min(granted, short)
+            short -= used
+            extra += granted - used
+        if extra > 0:
+            with self._lock:
+                self._tokens += extra
+
+    def close(self) -> None:
+        """Return unspent prepaid tokens so parallel invocations can use them."""
+
+        with self._lock:
+            leftover, self._tokens = self._tokens, 0.0
+        if leftover > 0 and _THROTTLE_ACTIVE:
+            _get_req_bucket().release(leftover)
+
+
+# (base, spread) seconds per retry, i.e. uniform(lo, hi) * growth**attempt
+# precomputed so a 429 costs one random() call. Later attempts reuse the last row.
+_READ_BACKOFF = tuple((2.0 * 2.0**i, 3.0 * 2.0**i) for i in range(6))
+_WRITE_BACKOFF = tuple((15.0 * 1.6**i, 20.0 * 1.6**i) for i in range(6))
+
+
+def _backoff_s(table, attempt: int) -> float:
+    base, spread = table[min(attempt, len(table) - 1)]
+    return base + random.random() * spread
+
+
+def _retry_on_429(fn, table, *, attempts: int, verbose: bool):
+    """Call `fn`, sleeping per `table` and retrying while it raises rate-limit errors."""
+
+    retries = max(0, int(attempts) - 1)
     attempt = 0
     while True:
         try:
             return fn()
         except Exception as e:
-            if is_rate_limited(e) and attempt < max(0, int(attempts) - 1):
-                wait_s = random.uniform(15.0, 35.0) * (1.6**attempt)
+            if attempt >= retries or not is_rate_limited(e):
+                raise
+            wait_s = _backoff_s(table, attempt)
+            if verbose:
                 print(f"Rate limited; backing off {wait_s:.1f}s ...", file=sys.stderr)
-                time.sleep(wait_s)
-                attempt += 1
-                continue
-            raise
+            time.sleep(wait_s)
+            attempt += 1
+
+
+def call_with_read_backoff(fn, *, attempts: int = 3):
+    """Generic wrapper for read-ish calls: throttle + retry on 429."""
+
+    throttle_req(1.0)
+    return _retry_on_429(fn, _READ_BACKOFF, attempts=attempts, verbose=False)
+
+
+def call_with_read_backoff_batch(fns, *, attempts: int = 3, return_exceptions: bool = False) -> list:
+    """call_with_read_backoff for several calls, throttled in bulk.
+
+    Tokens for all of `fns` are pulled from the shared bucket a burst at a
+    time rather than one round-trip per call. With `return_exceptions`, a call
+    that still fails after its retries yields its exception in the result list
+    instead of aborting the rest.
+    """
+
+    fns = list(fns)
+    tokens = PrepaidTokens(batch=len(fns))
+    results = []
+    try:
+        for fn in fns:
+            tokens.take()
+            try:
+                results.append(_retry_on_429(fn, _READ_BACKOFF, attempts=attempts, verbose=False))
+            except Exception as e:
+                if not return_exceptions:
+                    raise
+                results.append(e)
+    finally:
+        tokens.close()
+    return results
+
+
+def call_with_write_backoff(fn, *, attempts: int = 3, points: float = WRITE_CREATE_POINTS):
+    """Generic wrapper for write-ish calls: throttle + longer retry on 429.
+
+    `points` is the call's cost against the write budget (WRITE_DELETE_POINTS for deletes).
+    """
+
+    throttle_req(1.0)
+    throttle_write(points)
+    return _retry_on_429(fn, _WRITE_BACKOFF, attempts=attempts, verbose=True)
+
+
+def server_retry_after(err: Exception) -> float | None:
+    """Seconds the server asked us to wait (Retry-After, else RateLimit-Reset), if it said."""
+
+    try:
+        delay = getattr(err, "retry_after", None)
+        if delay is None:
+            reset_at = getattr(err, "reset_at", None)
+            delay = reset_at.timestamp() - time.time() if reset_at is not None else None
+    except Exception:
+        return None
+    if isinstance(delay, (int, float)) and math.isfinite(delay):
+        return max(0.0, float(delay))
+    return None
+
+
+class AdaptiveBackoff:
+    """429 backoff for a long-running loop, shared by its worker threads.
+
+    Uses the server's Retry-After / RateLimit-Reset when present. Otherwise the
+    delay doubles with each 429 episode seen in the last `window_s` seconds
+    (base..2*base for the first). Either way a single wait is capped at
+    `max_s`. Workers that hit a 429 while a backoff is already running just
+    wait for that one to end instead of escalating it again. cancel() wakes
+    every waiting worker at once (used on Ctrl-C so nobody sleeps out a long
+    backoff).
+    """
+
+    def __init__(self, *, base_s: float = 20.0, max_s: float = 600.0, window_s: float = 120.0):
+        self.base_s = base_s
+        self.max_s = max_s
+        self.window_s = window_s
+        self._episodes: deque[float] = deque()
+        self._until = 0.0
+        self._lock = threading.Lock()
+        self._cancelled = threading.Event()
+
+    @property
+    def cancelled(self) -> bool:
+        return self._cancelled.is_set()
+
+    def cancel(self) -> None:
+        self._cancelled.set()
+
+    def wait_after_429(self, err: Exception, *, buffer: float = 0.0) -> float:
+        with self._lock:
+            now = time.monotonic()
+            if now < self._until:
+                wait_s = self._until - now
+            else:
+                while self._episodes and now - self._episodes[0] > self.window_s:
+                    self._episodes.popleft()
+                recent = len(self._episodes)
+                self._episodes.append(now)
+
+                hint = server_retry_after(err)
+                if hint is not None:
+                    wait_s = max(1.0, hint) + random.random() * 2.0
+                else:
+                    wait_s = self.base_s * 2.0 ** min(recent, 16) * (1.0 + random.random())
+                wait_s = min(self.max_s, wait_s * (1.0 + float(buffer)))
+                self._until = now + wait_s
+                if hint is not None and hint > wait_s:
+                    # e.g. an hourly/daily write limit: retry (and likely fail
+                    # fast again) rather than go quiet for hours.
+                    print(
+                        f"Rate limited; server resets in {hint / 60:.0f} min, retrying in {wait_s:.1f}s ...",
+                        file=sys.stderr,
+                    )
+                else:
+                    print(f"Rate limited; backing off {wait_s:.1f}s ...", file=sys.stderr)
+        self._cancelled.wait(wait_s)
+        return wait_s
+
+
+# Last-resort message matching when an error carries no type or status to go
+# on. One case-insensitive scan, no lowercased copy of the message.
+_RATE_LIMITED_RE = re.compile(r"429|rate ?limit|TooManyRequests", re.IGNORECASE)
+_ALREADY_EXISTS_RE = re.compile(r"already ?exists|Duplicate", re.IGNORECASE)
+_CONFLICT_ERRORS_RE = re.compile(r"\w*(AlreadyExists|Duplicate)\w*")
+
+
+@functools.lru_cache(maxsize=1)
+def _rate_limit_types() -> tuple[type, ...]:
+    # Imported on first error only, so the module stays importable without atproto.
+    try:
+        from atproto_client.exceptions import RateLimitExceededError  # type: ignore
+    except Exception:
+        return ()
+    return (RateLimitExceededError,)
+
+
+def _xrpc_error(err: Exception):
+    """Return (status_code, xrpc error text) from an atproto response, if there is one."""
+
+    response = getattr(err, "response", None)
+    status = getattr(response, "status_code", None)
+    if not isinstance(status, int):
+        return None, None
+    content = getattr(response, "content", None)
+    text = " ".join(str(v) for v in (getattr(content, "error", None), getattr(content, "message", None)) if v)
+    return status, text
 
 
 def is_rate_limited(err: Exception) -> bool:
-    msg = str(err)
-    return (
-        "429" in msg
-        or "RateLimit" in msg
-        or "rate limit" in msg.lower()
-        or "TooManyRequests" in msg
-        or "ratelimit" in msg.lower()
-    )
+    if isinstance(err, _rate_limit_types()):
+        return True
+    name = type(err).__name__
+    if "RateLimit" in name or "TooMany" in name:
+        return True
+    status, _ = _xrpc_error(err)
+    if status is not None:
+        return status == 429
+
+    return _RATE_LIMITED_RE.search(str(err)) is not None
 
 
 def is_already_exists(err: Exception) -> bool:
-    msg = str(err)
-    return (
-        "AlreadyExists" in msg
-        or "already exists" in msg.lower()
-        or "Duplicate" in msg
-        or "DuplicateRecord" in msg
-        or "RecordAlreadyExists" in msg
-    )
+    if "AlreadyExists" in type(err).__name__:
+        return True
+    status, text = _xrpc_error(err)
+    if status == 409:
+        # atproto raises 409 Conflict as a retryable NetworkError; only the
+        # XRPC error name tells a duplicate record from a transient conflict.
+        name = getattr(getattr(err.response, "content", None), "error", None)
+        return isinstance(name, str) and _CONFLICT_ERRORS_RE.fullmatch(name) is not None
+    # With a response in hand, only the XRPC error/message matter; no need to format str(err).
+    msg = text if status is not None else str(err)
+    return _ALREADY_EXISTS_RE.search(msg) is not None
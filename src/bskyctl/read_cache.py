@@ -0,0 +1,47 @@
+"""Short-lived on-disk cache for read-only commands (profile/search/notifications).
+
+Opt-in via `--cache-ttl N`: repeating the same command within N seconds is
+answered from disk without logging in or touching the network, which helps
+shell pipelines and watch loops. Entries are keyed by profile + command +
+arguments and hold the response's JSON dump; anything unreadable is a miss.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import os
+import time
+
+from .config import load_config_cached
+from .ratelimit import CACHE_DIR
+from .utils import atomic_write_json, json_dumps, json_loads
+
+READ_CACHE_DIR = CACHE_DIR / "reads"
+
+
+def read_key(args, command: str, *parts) -> tuple:
+    """Cache key for `command`, scoped to the profile the command would use."""
+
+    profile = args.profile or os.getenv("BSKY_PROFILE") or load_config_cached().get("active")
+    return (profile, command, *parts)
+
+
+def cached_read(key: tuple, ttl: float, model, fetch):
+    """Return `fetch()`, or a `model` rebuilt from a cached response younger than `ttl` seconds."""
+
+    if not ttl or ttl <= 0:
+        return fetch()
+
+    path = READ_CACHE_DIR / f"{hashlib.sha1(json_dumps(list(key))).hexdigest()}.json"
+    try:
+        if time.time() - path.stat().st_mtime < ttl:
+            return model.model_validate(json_loads(path.read_bytes()))
+    except Exception:
+        pass
+
+    resp = fetch()
+    try:
+        atomic_write_json(path, resp.model_dump(mode="json", by_alias=True, exclude_none=True))
+    except Exception:
+        pass
+    return resp
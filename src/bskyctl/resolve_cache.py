@@ -0,0 +1,147 @@
+"""Handle -> DID resolution cache.
+
+Handles are resolved a lot (mentions, post URLs, follow lists) and rarely
+change, so we keep a process-wide map in front of a small on-disk cache with
+a TTL. New entries are written back once, at exit. The disk cache is best
+effort: any read/write problem just means we go to the network.
+"""
+
+from __future__ import annotations
+
+import atexit
+import functools
+import threading
+import time
+
+from .ratelimit import CACHE_DIR, call_with_read_backoff, call_with_read_backoff_batch
+from .utils import atomic_write_json, json_loads
+
+HANDLE_CACHE_PATH = CACHE_DIR / "handles.json"
+HANDLE_CACHE_TTL_S = 7 * 24 * 3600
+# app.bsky.actor.getProfiles accepts at most 25 actors per call.
+PROFILES_BATCH = 25
+
+_HANDLE_DID_CACHE: dict[str, str] = {}
+# Guards the disk dict (follow/unfollow resolve from worker threads).
+_DISK_LOCK = threading.Lock()
+_dirty = False
+
+
+@functools.lru_cache(maxsize=1)
+def _disk_cache() -> dict:
+    try:
+        data = json_loads(HANDLE_CACHE_PATH.read_bytes())
+    except Exception:
+        return {}
+    return data if isinstance(data, dict) else {}
+
+
+def _is_fresh(entry, now: float) -> bool:
+    if not isinstance(entry, dict) or not entry.get("did"):
+        return False
+    try:
+        return now - float(entry.get("ts", 0)) < HANDLE_CACHE_TTL_S
+    except (TypeError, ValueError):
+        return False
+
+
+def cached_did(handle: str) -> str | None:
+    """Return the cached DID for `handle` (memory first, then disk), if any."""
+
+    key = handle.lower()
+    did = _HANDLE_DID_CACHE.get(key)
+    if did:
+        return did
+
+    entry = _disk_cache().get(key)
+    if not _is_fresh(entry, time.time()):
+        return None
+
+    did = entry["did"]
+    _HANDLE_DID_CACHE[key] = did
+    return did
+
+
+def remember_did(handle: str, did: str) -> None:
+    remember_dids({handle: did})
+
+
+def remember_dids(mapping: dict[str, str]) -> None:
+    """Cache several handle -> DID pairs (persisted at exit)."""
+
+    global _dirty
+    if not mapping:
+        return
+    for handle, did in mapping.items():
+        _HANDLE_DID_CACHE[handle.lower()] = did
+
+    now = time.time()
+    with _DISK_LOCK:
+        disk = _disk_cache()
+        for handle, did in mapping.items():
+            disk[handle.lower()] = {"did": did, "ts": now}
+        if not _dirty:
+            _dirty = True
+            atexit.register(_flush)
+
+
+def _flush() -> None:
+    """Write the disk cache back if this process added entries."""
+
+    global _dirty
+    with _DISK_LOCK:
+        if not _dirty:
+            return
+        _dirty = False
+        now = time.time()
+        disk = _disk_cache()
+        # Drop expired entries while we are rewriting the file anyway.
+        for k in [k for k, v in disk.items() if not _is_fresh(v, now)]:
+            del disk[k]
+        try:
+            atomic_write_json(HANDLE_CACHE_PATH, disk)
+        except Exception:
+            pass
+
+
+def prefetch_dids(client, handles) -> None:
+    """Resolve uncached handles in bulk via getProfiles (25 per request).
+
+    Best effort: handles missing from a response, or a chunk whose request
+    fails, are simply left for resolve_did()/resolve_handle() one by one.
+    """
+
+    todo = [h for h in dict.fromkeys(handles) if not h.startswith("did:") and cached_did(h) is None]
+    chunks = [todo[i : i + PROFILES_BATCH] for i in range(0, len(todo), PROFILES_BATCH)]
+    responses = call_with_read_backoff_batch(
+        [functools.partial(client.app.bsky.actor.get_profiles, {"actors": chunk}) for chunk in chunks],
+        return_exceptions=True,
+    )
+    for chunk, resp in zip(chunks, responses):
+        if isinstance(resp, Exception):
+            continue
+
+        wanted = {h.lower() for h in chunk}
+        found: dict[str, str] = {}
+        for profile in getattr(resp, "profiles", None) or []:
+            handle = getattr(profile, "handle", None)
+            did = getattr(profile, "did", None)
+            if handle and did and handle.lower() in wanted:
+                found[handle] = did
+        remember_dids(found)
+
+
+def resolve_did(client, handle: str) -> str:
+    """Resolve a handle to a DID via the cache, falling back to `resolve_handle`.
+
+    DIDs are passed through unchanged.
+    """
+
+    if handle.startswith("did:"):
+        return handle
+
+    did = cached_did(handle)
+    if did is None:
+        did = call_with_read_backoff(functools.partial(client.resolve_handle, handle)).did
+        remember_did(handle, did)
+    return did
@@ -1,48 +1,130 @@
 from __future__ import annotations
 
+import atexit
+import contextlib
+import functools
 import json
 import os
 import random
+import sys
 import time
 from pathlib import Path
 
+try:
+    import orjson  # optional; faster JSON for cache/config files
+except Exception:  # pragma: no cover
+    orjson = None
+
+_IO_BUFFER = 64 * 1024
+
+if orjson is not None:
+    json_loads = orjson.loads
+
+    def json_dumps(data, *, pretty: bool = False) -> bytes:
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2 if pretty else None)
+
+else:
+    json_loads = json.loads
+
+    def json_dumps(data, *, pretty: bool = False) -> bytes:
+        if pretty:
+            return json.dumps(data, indent=2).encode("utf-8")
+        return json.dumps(data, separators=(",", ":")).encode("utf-8")
+
+
+def temp_path_for(path: Path) -> Path:
+    """Sibling temp file for an atomic write of `path`, unique per process.
+
+    The pid keeps concurrent bskyctl runs from writing into (and renaming)
+    each other's half-written temp file.
+    """
+
+    return path.parent / f"{path.name}.{os.getpid()}.tmp"
+
+
+# Parent directories already created (or found) by this process.
+_ENSURED_DIRS: set[Path] = set()
+
+
+def _ensure_parent(path: Path) -> None:
+    # Checkpoints rewrite the same files over and over; mkdir'ing their parent
+    # once per process is enough. (Set ops are GIL-atomic; mkdir is idempotent.)
+    parent = path.parent
+    if parent not in _ENSURED_DIRS:
+        parent.mkdir(parents=True, exist_ok=True)
+        _ENSURED_DIRS.add(parent)
+
 
 def atomic_write_json(path: Path, data: dict) -> None:
-    path.parent.mkdir(parents=True, exist_ok=True)
-    tmp = path.with_suffix(path.suffix + ".tmp")
-    tmp.write_text(json.dumps(data, separators=(",", ":")), encoding="utf-8")
+    _ensure_parent(path)
+    tmp = temp_path_for(path)
+    with open(tmp, "wb") as f:
+        f.write(json_dumps(data))
     os.replace(tmp, path)
 
 
+def _plain(obj):
+    if hasattr(obj, "model_dump"):  # atproto (pydantic) models
+        return obj.model_dump(mode="json", by_alias=True, exclude_none=True)
+    return obj
+
+
+def write_json_stdout(data) -> None:
+    """Write an atproto model, or a list of them, to stdout as one line of JSON (--json)."""
+
+    data = [_plain(d) for d in data] if isinstance(data, list) else _plain(data)
+    sys.stdout.flush()
+    sys.stdout.buffer.write(json_dumps(data) + b"\n")
+
+
 def read_actor_lines(path: str) -> list[str]:
+    """Return the unique entries of a list file, memoized by (path, mtime, size).
+
+    clear_actor_cache() empties the memo.
+    """
+
     p = Path(path).expanduser()
-    if not p.exists():
-        raise RuntimeError(f"List file not found: {p}")
-
-    out: list[str] = []
-    for raw in p.read_text(encoding="utf-8").splitlines():
-        line = raw.strip()
-        if not line:
-            continue
-        if line.startswith("#"):
-            continue
-        # allow inline comments
-        if "#" in line:
-            line = line.split("#", 1)[0].strip()
-        if not line:
-            continue
-        out.append(line)
-
-    # de-dupe while preserving order
-    seen: set[str] = set()
-    uniq: list[str] = []
-    for a in out:
-        if a in seen:
-            continue
-        seen.add(a)
-        uniq.append(a)
+    try:
+        st = p.stat()
+    except FileNotFoundError:
+        raise RuntimeError(f"List file not found: {p}") from None
+
+    # Keyed on mtime/size, so any rewrite of the file is a cache miss.
+    return list(_parse_actor_file(str(p.resolve()), st.st_mtime_ns, st.st_size))
+
+
+@functools.lru_cache(maxsize=16)
+def _parse_actor_file(path: str, _mtime_ns: int, _size: int) -> tuple[str, ...]:
+    return tuple(iter_actor_lines(path))
+
+
+def clear_actor_cache() -> None:
+    """Drop memoized list files (e.g. after editing one within the same mtime tick)."""
 
-    return uniq
+    _parse_actor_file.cache_clear()
+
+
+def iter_actor_lines(path: str):
+    """Yield the unique handles/DIDs of a list file in order, streaming.
+
+    Blank lines and `#` comments (whole-line or inline) are skipped. Only the
+    distinct entries seen so far are held in memory, never the whole file.
+    """
+
+    p = Path(path).expanduser()
+    try:
+        f = p.open("r", encoding="utf-8", buffering=_IO_BUFFER)
+    except FileNotFoundError:
+        raise RuntimeError(f"List file not found: {p}") from None
+
+    seen: set[str] = set()
+    with f:
+        for raw in f:
+            # One partition drops both "# ..." lines and inline comments.
+            line = raw.partition("#")[0].strip()
+            if line and line not in seen:
+                seen.add(line)
+                yield line
 
 
 def sleep_between(min_delay: float, max_delay: float, buffer: float) -> None:
@@ -53,32 +135,88 @@ def sleep_between(min_delay: float, max_delay: float, buffer: float) -> None:
     time.sleep(random.uniform(min_d, max_d))
 
 
-def append_line(path: str | None, line: str) -> None:
-    if not path:
-        return
-    p = Path(path).expanduser()
-    p.parent.mkdir(parents=True, exist_ok=True)
-    with p.open("a", encoding="utf-8") as f:
-        f.write(line.rstrip("\n") + "\n")
+class BufferedLogWriter:
+    """Append-only line log that keeps its file open and flushes every `flush_every` lines.
+
+    A `None` path is a no-op, and the file is only created on the first write. Pending lines are
+    flushed by close(), which is also registered with atexit.
+    """
+
+    def __init__(self, path: str | None, flush_every: int = 25):
+        self.path = path
+        self.flush_every = max(1, flush_every)
+        self._fh = None
+        self._pending = 0
+
+    def write(self, line: str) -> None:
+        if not self.path:
+            return
+        if self._fh is None:
+            p = Path(self.path).expanduser()
+            _ensure_parent(p)
+            self._fh = open(p, "a", encoding="utf-8", buffering=_IO_BUFFER)
+            atexit.register(self.close)
+        self._fh.write(line.rstrip("\n") + "\n")
+        self._pending += 1
+        if self._pending >= self.flush_every:
+            self.flush()
+
+    def flush(self) -> None:
+        if self._fh is not None and self._pending:
+            self._fh.flush()
+            self._pending = 0
+
+    def close(self) -> None:
+        if self._fh is not None:
+            fh, self._fh = self._fh, None
+            fh.close()
+            atexit.unregister(self.close)
 
 
 def atomic_write_lines(path: str, lines: list[str]) -> None:
     p = Path(path).expanduser()
-    p.parent.mkdir(parents=True, exist_ok=True)
-    tmp = p.with_suffix(p.suffix + ".tmp")
-    tmp.write_text("\n".join(lines) + ("\n" if lines else ""), encoding="utf-8")
+    _ensure_parent(p)
+    tmp = temp_path_for(p)
+    # Stream through a 64 KiB buffer instead of joining one big string first,
+    # and fsync before the rename so a crash can't leave an empty list behind.
+    with open(tmp, "wb", buffering=_IO_BUFFER) as f:
+        f.writelines(line.encode("utf-8") + b"\n" for line in lines)
+        f.flush()
+        os.fsync(f.fileno())
     os.replace(tmp, p)
 
 
+@contextlib.contextmanager
+def atomic_text_writer(path: str):
+    """Stream text into `path`: written to a temp file, renamed over `path` on success only."""
+
+    p = Path(path).expanduser()
+    _ensure_parent(p)
+    tmp = temp_path_for(p)
+    f = open(tmp, "w", encoding="utf-8", buffering=_IO_BUFFER)
+    try:
+        yield f
+        f.close()
+        os.replace(tmp, p)
+    except BaseException:
+        f.close()
+        with contextlib.suppress(OSError):
+            os.unlink(tmp)
+        raise
+
+
 def rewrite_list_file(path: str, remaining: list[str]) -> None:
     atomic_write_lines(path, remaining)
 
 
+_DEFAULT_HANDLE_SUFFIX = ".bsky.social"
+
+
 def normalize_handle(value: str) -> str:
     value = value.strip()
-    if value.startswith("@"):
+    if value[:1] == "@":
         value = value[1:]
     # If no domain is provided, assume .bsky.social
-    if value and "." not in value and not value.startswith("did:"):
-        value = f"{value}.bsky.social"
-    return value
+    if not value or "." in value or value.startswith("did:"):
+        return value
+    return value + _DEFAULT_HANDLE_SUFFIX